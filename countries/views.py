@@ -81,13 +81,13 @@ class CreateCountryFromExcel(APIView):
 
         created_countries = []
 
-        for index, row in df.iterrows():
-            name = str(row['name']).strip() if pd.notna(row['name']) else ''
-            code = str(row['code']).strip().upper() if pd.notna(row['code']) else ''
+        for row in df.itertuples():
+            name = str(row.name).strip() if pd.notna(row.name) else ''
+            code = str(row.code).strip().upper() if pd.notna(row.code) else ''
 
             if not name or not code:
                 skipped_rows.append({
-                    'row': index + 2,
+                    'row': row.Index + 2,
                     'reason': "Missing name or code."
                 })
                 continue
@@ -101,12 +101,12 @@ class CreateCountryFromExcel(APIView):
             currency_name = ''
 
             if has_currency_code:
-                value = row['currency_code']
+                value = row.currency_code
                 if pd.notna(value) and str(value).strip():
                     currency_code = str(value).strip().upper()
 
             if has_currency_name:
-                value = row['currency_name']
+                value = row.currency_name
                 if pd.notna(value) and str(value).strip():
                     currency_name = str(value).strip()
 
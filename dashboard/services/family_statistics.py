@@ -7,6 +7,7 @@ from .base import (
     generate_periods, serie_to_pairs, format_series_for_multi_line_chart,
     format_top_clients_series, format_top_insureds_series, sanitize_float
 )
+from collections import defaultdict
 import logging
 from .insured_statistics import fill_full_series_forward_fill
 
@@ -626,75 +627,88 @@ class ClientFamilyListService:
     def get_families_list(self):
         """
         Retourne la liste des familles avec leurs détails pour ce client.
+
+        Les membres et la consommation par assuré sont chargés en deux requêtes
+        agrégées, puis regroupés par famille en mémoire.
         """
         try:
             families_data = []
 
-            # Récupérer tous les assurés principaux du client
-            primary_insureds = self.insured_employers.filter(role='primary').select_related(
-                'insured', 'policy'
-            )
-
-            for primary_ie in primary_insureds:
-                primary_insured = primary_ie.insured
-                policy = primary_ie.policy
-
-                # Trouver tous les membres de cette famille
-                family_members = self.insured_employers.filter(
-                    Q(role='primary', insured=primary_insured) |
-                    Q(primary_insured_ref=primary_insured) |
-                    Q(role='spouse', primary_insured_ref=primary_insured) |
-                    Q(role='child', primary_insured_ref=primary_insured)
-                ).select_related('insured')
-
-                family_insured_ids = list(family_members.values_list('insured_id', flat=True))
-                family_members_count = len(family_insured_ids)
+            members = list(self.insured_employers.values(
+                'insured_id', 'role', 'primary_insured_ref_id',
+                'insured__name', 'insured__card_number',
+                'policy_id', 'policy__policy_number', 'policy__creation_date'
+            ))
 
-                # Calculer la consommation de la famille sur la période
-                family_claims = self.claims.filter(insured_id__in=family_insured_ids)
-                family_consumption = family_claims.aggregate(
+            consumption_by_insured = {
+                row['insured_id']: row
+                for row in self.claims.values('insured_id').annotate(
                     total_claimed=Sum('invoice__claimed_amount'),
                     total_reimbursed=Sum('invoice__reimbursed_amount'),
                     claims_count=Count('id')
                 )
+            }
+
+            # Membres de chaque famille, indexés par l'assuré principal
+            members_by_primary = defaultdict(list)
+            for member in members:
+                if member['role'] == 'primary':
+                    members_by_primary[member['insured_id']].append(member)
+                ref_id = member['primary_insured_ref_id']
+                if ref_id is not None and not (member['role'] == 'primary' and ref_id == member['insured_id']):
+                    members_by_primary[ref_id].append(member)
+
+            for primary_ie in members:
+                if primary_ie['role'] != 'primary':
+                    continue
+
+                family_members = members_by_primary[primary_ie['insured_id']]
+                family_members_count = len(family_members)
+
+                # Calculer la consommation de la famille sur la période
+                total_claimed = 0
+                total_reimbursed = 0
+                claims_count = 0
+                for insured_id in {member['insured_id'] for member in family_members}:
+                    consumption = consumption_by_insured.get(insured_id)
+                    if consumption:
+                        total_claimed += consumption['total_claimed'] or 0
+                        total_reimbursed += consumption['total_reimbursed'] or 0
+                        claims_count += consumption['claims_count']
 
                 # Calculer le ratio S/P (Sinistres/Primes)
                 sp_ratio = 0
                 if self.client.prime and self.client.prime > 0:
-                    sp_ratio = (family_consumption['total_reimbursed'] or 0) / float(self.client.prime)
+                    sp_ratio = total_reimbursed / float(self.client.prime)
 
                 # Détails des membres de la famille
                 family_members_details = []
                 for member_ie in family_members:
-                    member_insured = member_ie.insured
-                    member_claims = self.claims.filter(insured=member_insured)
-                    member_consumption = member_claims.aggregate(
-                        total_reimbursed=Sum('invoice__reimbursed_amount')
-                    )['total_reimbursed'] or 0
-
+                    member_consumption = consumption_by_insured.get(member_ie['insured_id'])
                     family_members_details.append({
-                        'id': member_insured.id,
-                        'name': member_insured.name,
-                        'role': member_ie.role,
-                        'card_number': member_insured.card_number,
-                        'consumption': float(member_consumption),
-                        'is_primary': member_ie.role == 'primary'
+                        'id': member_ie['insured_id'],
+                        'name': member_ie['insured__name'],
+                        'role': member_ie['role'],
+                        'card_number': member_ie['insured__card_number'],
+                        'consumption': float(member_consumption['total_reimbursed'] or 0) if member_consumption else 0.0,
+                        'is_primary': member_ie['role'] == 'primary'
                     })
 
+                policy_creation_date = primary_ie['policy__creation_date']
                 family_data = {
-                    'family_id': primary_insured.id,
-                    'family_name': primary_insured.name,
+                    'family_id': primary_ie['insured_id'],
+                    'family_name': primary_ie['insured__name'],
                     'policy': {
-                        'id': policy.id,
-                        'policy_number': policy.policy_number,
-                        'creation_date': policy.creation_date.isoformat() if policy.creation_date else None
+                        'id': primary_ie['policy_id'],
+                        'policy_number': primary_ie['policy__policy_number'],
+                        'creation_date': policy_creation_date.isoformat() if policy_creation_date else None
                     },
                     'family_members_count': family_members_count,
                     'family_members': family_members_details,
                     'consumption': {
-                        'total_claimed': float(family_consumption['total_claimed'] or 0),
-                        'total_reimbursed': float(family_consumption['total_reimbursed'] or 0),
-                        'claims_count': family_consumption['claims_count'] or 0,
+                        'total_claimed': float(total_claimed),
+                        'total_reimbursed': float(total_reimbursed),
+                        'claims_count': claims_count,
                         'sp_ratio': round(sp_ratio, 4)
                     },
                     'period': {
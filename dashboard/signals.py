@@ -0,0 +1,35 @@
+import logging
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Client, Policy
+from countries.models import Country
+
+logger = logging.getLogger(__name__)
+
+
+def clear_filter_options_cache():
+    """
+    Flush the cached policy list filter options. A cache failure (e.g. Redis
+    unreachable) is logged and never propagated: the options then refresh
+    when their timeout expires.
+    """
+    try:
+        caches['filter_options'].clear()
+    except Exception:
+        logger.exception("Could not clear the filter_options cache")
+
+
+@receiver([post_save, post_delete], sender=Country)
+@receiver([post_save, post_delete], sender=Client)
+@receiver([post_save, post_delete], sender=Policy)
+def invalidate_filter_options_cache(sender, **kwargs):
+    """
+    Flush the cached policy list filter options (countries, clients and their
+    policy counts) whenever one of the underlying rows changes, once the
+    write is committed.
+    """
+    transaction.on_commit(clear_filter_options_cache)
@@ -1,4 +1,9 @@
 from django.forms import ValidationError
+from functools import wraps
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -22,12 +27,48 @@ from .services.family_statistics import (
     ClientFamilyStatisticsService,
     ClientFamilyListService,
 )
-import traceback
-
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Filter options (countries, clients) only change when those rows change, so
+# they are cached per Authorization header in the shared 'filter_options' cache.
+# It is flushed by dashboard.signals on save/delete and by async_import_data after
+# an import (its bulk inserts send no signals); other writes show up within the timeout.
+FILTER_OPTIONS_CACHE_TIMEOUT = 60 * 15
+
+
+def server_side_cache_only(view_func):
+    """
+    Strips the Expires/max-age headers set by cache_page so that browsers revalidate
+    every time: only the server-side cache, which the invalidations above clear, holds
+    the data. An unrendered response is patched after cache_page has stored it, since
+    cache_page does not store a response marked private or max-age=0.
+    """
+    def keep_out_of_browser_cache(response):
+        del response['Expires']
+        patch_cache_control(response, private=True, max_age=0)
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        response = view_func(*args, **kwargs)
+        if getattr(response, 'is_rendered', True):
+            keep_out_of_browser_cache(response)
+        else:
+            response.add_post_render_callback(keep_out_of_browser_cache)
+        return response
+    return wrapper
+
+
+cache_filter_options = method_decorator(
+    [
+        server_side_cache_only,
+        cache_page(FILTER_OPTIONS_CACHE_TIMEOUT, cache='filter_options'),
+        vary_on_headers('Authorization'),
+    ],
+    name='get',
+)
+
 class CountryStatisticsDetailView(APIView):
     """
     API endpoint to retrieve time series statistics for a specific country over a given period.
@@ -91,8 +132,7 @@ class CountryStatisticsDetailView(APIView):
             
         except Exception as e:
             # Erreurs système
-            print("ERREUR API CountryStatisticsDetailView:", str(e))
-            traceback.print_exc()
+            logger.exception("CountryStatisticsDetailView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -148,8 +188,7 @@ class ClientStatisticsDetailView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error in CountryClientStatisticsDetailView: {e}")
-            traceback.print_exc()
+            logger.exception("ClientStatisticsDetailView.get failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -194,8 +233,7 @@ class ClientStatisticsDetailView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error in CountryClientStatisticsDetailView POST: {e}")
-            traceback.print_exc()
+            logger.exception("ClientStatisticsDetailView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -242,8 +280,7 @@ class GlobalClientStatisticsDetailView(APIView):
             return Response(statistics_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error in GlobalClientStatisticsDetailView: {e}")
-            traceback.print_exc()
+            logger.exception("GlobalClientStatisticsDetailView.get failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -311,8 +348,7 @@ class GlobalStatisticsDetailView(APIView):
             
         except Exception as e:
             # Erreurs système
-            print("ERREUR API CountryStatisticsDetailView:", str(e))
-            traceback.print_exc()
+            logger.exception("GlobalStatisticsDetailView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -373,8 +409,7 @@ class GlobalCountriesListStatisticsView(APIView):
             )
 
         except Exception as e:
-            print("ERREUR API CountriesListStatisticsView:", str(e))
-            traceback.print_exc()
+            logger.exception("GlobalCountriesListStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -684,8 +719,7 @@ class GlobalPartnerStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in partner statistics: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("GlobalPartnerStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -763,8 +797,7 @@ class GlobalPartnerListStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in partner list statistics: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("GlobalPartnerListStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -827,8 +860,7 @@ class CountryPartnerStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in country partner statistics: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("CountryPartnerStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -888,8 +920,7 @@ class CountryPartnerListStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in country partner list: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("CountryPartnerListStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -949,8 +980,7 @@ class ClientPartnerStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in client partner statistics: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("ClientPartnerStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1011,8 +1041,7 @@ class ClientPartnerListStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in client partner list: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("ClientPartnerListStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1072,8 +1101,7 @@ class PolicyPartnerStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in policy partner statistics: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("PolicyPartnerStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1134,8 +1162,7 @@ class PolicyPartnerListStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in policy partner list: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("PolicyPartnerListStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1295,8 +1322,7 @@ class CountryInsuredListStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Unexpected error in policy partner list: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("CountryInsuredListStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Erreur interne du serveur."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1607,8 +1633,7 @@ class GlobalPolicyStatisticsView(APIView):
             return Response(statistics_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error in GlobalPolicyStatisticsView: {e}")
-            traceback.print_exc()
+            logger.exception("GlobalPolicyStatisticsView.get failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1677,8 +1702,7 @@ class GlobalPolicyStatisticsDetailView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error in GlobalPolicyStatisticsDetailView: {e}")
-            traceback.print_exc()
+            logger.exception("GlobalPolicyStatisticsDetailView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1742,8 +1766,7 @@ class CountryPolicyStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error in CountryPolicyStatisticsView: {e}")
-            traceback.print_exc()
+            logger.exception("CountryPolicyStatisticsView.get failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1795,8 +1818,7 @@ class CountryPolicyStatisticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error in CountryPolicyStatisticsView: {e}")
-            traceback.print_exc()
+            logger.exception("CountryPolicyStatisticsView.post failed", extra={"user": request.user.id})
             return Response(
                 {"error": "Une erreur interne s'est produite."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1804,6 +1826,7 @@ class CountryPolicyStatisticsView(APIView):
 
 
 
+@cache_filter_options
 class GlobalPolicyListView(APIView):
     """
     API endpoint to list policies with filtering capabilities for Global Administrators.
@@ -1942,6 +1965,7 @@ class GlobalPolicyListView(APIView):
             )
 
 
+@cache_filter_options
 class CountryPolicyListView(APIView):
     """
     API endpoint to list policies with filtering capabilities for Territorial Administrators.
@@ -1967,7 +1991,7 @@ class CountryPolicyListView(APIView):
     """
     permission_classes = [IsAuthenticated, IsTerritorialAdmin]
     
-    def get(self, request):
+    def get(self, request, country_id=None):
         """
         Get available filter options for territorial administrators.
         
@@ -0,0 +1,64 @@
+from django.db import migrations, models
+
+
+SIZE_UNITS = ['', 'K', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y']
+
+
+def parse_formatted_size(value):
+    """Converts a string produced by File.format_size (e.g. '12.34 Mo') back to bytes."""
+    try:
+        number, unit = value.split()
+        return int(float(number) * 1024 ** SIZE_UNITS.index(unit[:-1]))
+    except (AttributeError, ValueError):
+        return 0
+
+
+def format_size(size):
+    """Same output as File.format_size, e.g. 12939428 -> '12.34 Mo'."""
+    for unit in SIZE_UNITS[:-1]:
+        if size < 1024:
+            return f"{size:.2f} {unit}o"
+        size /= 1024
+    return f"{size:.2f} Yo"
+
+
+def backfill_size_bytes(apps, schema_editor):
+    File = apps.get_model("file_handling", "File")
+    files = list(File.objects.only("id", "size"))
+    for file in files:
+        file.size_bytes = parse_formatted_size(file.size)
+    File.objects.bulk_update(files, ["size_bytes"], batch_size=500)
+
+
+def restore_size(apps, schema_editor):
+    File = apps.get_model("file_handling", "File")
+    files = list(File.objects.only("id", "size_bytes"))
+    for file in files:
+        file.size = format_size(file.size_bytes)
+    File.objects.bulk_update(files, ["size"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_handling", "0007_rename_file_name_file_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="size_bytes",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_size_bytes, restore_size),
+        # Default only used when unapplying: the re-added column is then filled by restore_size
+        migrations.AlterField(
+            model_name="file",
+            name="size",
+            field=models.CharField(max_length=20, editable=False, default=""),
+        ),
+        migrations.RemoveField(
+            model_name="file",
+            name="size",
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_handling", "0008_file_size_bytes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="file",
+            index=models.Index(
+                fields=["country", "file_type", "-uploaded_at"],
+                name="file_country_type_upload_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importsession",
+            index=models.Index(
+                fields=["country", "status"], name="importsession_country_status"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importsession",
+            index=models.Index(
+                fields=["-created_at"], name="importsession_created_desc"
+            ),
+        ),
+    ]
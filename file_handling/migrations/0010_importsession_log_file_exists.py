@@ -0,0 +1,31 @@
+import os
+
+from django.db import migrations, models
+
+
+def backfill_log_file_exists(apps, schema_editor):
+    ImportSession = apps.get_model("file_handling", "ImportSession")
+    existing_ids = [
+        session_id
+        for session_id, log_file_path in ImportSession.objects.exclude(log_file_path__isnull=True)
+        .exclude(log_file_path="")
+        .values_list("id", "log_file_path")
+        if os.path.exists(log_file_path)
+    ]
+    ImportSession.objects.filter(id__in=existing_ids).update(log_file_exists=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_handling", "0009_file_and_importsession_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importsession",
+            name="log_file_exists",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_log_file_exists, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("file_handling", "0010_importsession_log_file_exists"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="file",
+            index=models.Index(
+                fields=["country", "-uploaded_at"], name="file_country_upload_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importsession",
+            index=models.Index(
+                fields=["country", "-created_at"], name="importsession_country_created"
+            ),
+        ),
+    ]
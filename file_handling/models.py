@@ -21,7 +21,7 @@ class File(models.Model):
     name = models.CharField(max_length=255)
     file_type = models.CharField(max_length=5, choices=FILE_TYPE_CHOICES)
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    size = models.CharField(max_length=20, editable=False)
+    size_bytes = models.PositiveBigIntegerField(default=0, editable=False)
     country = models.ForeignKey(Country, on_delete=models.CASCADE, null=True, blank=True)
     # import_session = models.ForeignKey('ImportSession', on_delete=models.CASCADE, null=True, blank=True)
 
@@ -40,17 +40,30 @@ class File(models.Model):
             if not self.uploaded_by_email:
                 self.uploaded_by_email = self.user.email
         
-        self.size = self.format_size(self.file.size)
+        if self._state.adding:
+            self.size_bytes = self.file.size
         
         super().save(*args, **kwargs)
 
-    def format_size(self, size):
+    @property
+    def size(self):
+        """Human readable size, formatted from size_bytes on read"""
+        return self.format_size(self.size_bytes)
+
+    @staticmethod
+    def format_size(size):
         for unit in ['', 'K', 'M', 'G', 'T', 'P', 'E', 'Z']:
             if size < 1024:
                 return f"{size:.2f} {unit}o"
             size /= 1024
         return f"{size:.2f} Yo"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['country', 'file_type', '-uploaded_at'], name='file_country_type_upload_idx'),
+            models.Index(fields=['country', '-uploaded_at'], name='file_country_upload_idx'),
+        ]
+
     def __str__(self):
         return self.file.name
 
@@ -96,10 +109,18 @@ class ImportSession(models.Model):
     end_date = models.DateField(null=True, blank=True)
 
     log_file_path = models.CharField(max_length=500, blank=True, null=True)
+    log_file_exists = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['country', 'status'], name='importsession_country_status'),
+            models.Index(fields=['-created_at'], name='importsession_created_desc'),
+            models.Index(fields=['country', '-created_at'], name='importsession_country_created'),
+        ]
     
     def get_log_file_url(self):
-        """Returns the URL of the log file if it exists"""
-        if self.log_file_path and os.path.exists(self.log_file_path):
+        """Returns the URL of the log file if it has been written"""
+        if self.log_file_exists and self.log_file_path:
             relative_path = os.path.relpath(self.log_file_path, settings.MEDIA_ROOT)
             return f"{settings.MEDIA_URL}{relative_path}"
         return None
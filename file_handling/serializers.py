@@ -7,8 +7,8 @@ class FileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = File
-        fields = ['id', 'file', 'name', 'file_type', 'uploaded_at', 'size', 'user', 'country']
-        read_only_fields = ['name', 'uploaded_at', 'size', 'user', 'country']
+        fields = ['id', 'file', 'name', 'file_type', 'uploaded_at', 'size', 'size_bytes', 'user', 'country']
+        read_only_fields = ['name', 'uploaded_at', 'size', 'size_bytes', 'user', 'country']
 
     def create(self, validated_data):
         # Assign user from context or request
@@ -17,33 +17,60 @@ class FileSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+FILE_LIST_VALUES = (
+    'id', 'file', 'name', 'file_type', 'uploaded_at', 'size_bytes',
+    'user__username', 'country_id', 'country__name', 'country__currency_code',
+)
+
+
+def serialize_file_rows(rows):
+    """
+    Builds the same payload as FileSerializer(many=True) from `File.objects.values(*FILE_LIST_VALUES)`
+    rows, without instantiating models or the serializer field tree for each row.
+    """
+    storage = File._meta.get_field('file').storage
+    uploaded_at_field = serializers.DateTimeField()
+    return [
+        {
+            'id': row['id'],
+            'file': storage.url(row['file']) if row['file'] else None,
+            'name': row['name'],
+            'file_type': row['file_type'],
+            'uploaded_at': uploaded_at_field.to_representation(row['uploaded_at']),
+            'size': File.format_size(row['size_bytes']),
+            'size_bytes': row['size_bytes'],
+            'user': row['user__username'],
+            'country': f"{row['country__name']} ({row['country__currency_code']})" if row['country_id'] else None,
+        }
+        for row in rows
+    ]
+
+
 class ImportSessionSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     country = serializers.StringRelatedField(read_only=True)
     stat_file = FileSerializer(read_only=True)
     recap_file = FileSerializer(read_only=True)
 
-    error_file_url = serializers.SerializerMethodField()
-    log_file_url = serializers.SerializerMethodField()
-
 
     class Meta:
         model = ImportSession
         fields = [
             'id', 'user', 'country', 'stat_file', 'recap_file', 'status',
             'created_at', 'started_at', 'completed_at', 'error_file', 'message',
-            'error_file_url', 'log_file_url'
         ]
         read_only_fields = ['status', 'created_at', 'started_at', 'completed_at', 'message', 'error_file']
 
-    def get_error_file_url(self, obj):
-        request = self.context.get('request')
-        if obj.error_file:
-            return request.build_absolute_uri(f"/import-sessions/{obj.id}/download/?type=error")
-        return None
-
-    def get_log_file_url(self, obj):
-        request = self.context.get('request')
-        if obj.log_file_path:
-            return request.build_absolute_uri(f"/import-sessions/{obj.id}/download/?type=log")
-        return None
+    def get_base_uri(self):
+        """Scheme and host of the request, resolved once per serializer (shared by all rows when many=True)"""
+        if not hasattr(self, '_base_uri'):
+            request = self.context.get('request')
+            self._base_uri = request.build_absolute_uri('/')[:-1]
+        return self._base_uri
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        download_url = f"{self.get_base_uri()}/import-sessions/{instance.id}/download/"
+        data['error_file_url'] = f"{download_url}?type=error" if instance.error_file else None
+        data['log_file_url'] = f"{download_url}?type=log" if instance.log_file_exists else None
+        return data
@@ -1,26 +1,63 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import FileResponse
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, HttpResponse, Http404
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import JSONParser
+from rest_framework.pagination import LimitOffsetPagination
 from .models import File, ImportSession
 from core.models import Claim
-from .serializers import FileSerializer, ImportSessionSerializer
+from .serializers import ImportSessionSerializer, FILE_LIST_VALUES, serialize_file_rows
 from users.permissions import IsTerritorialAdmin, IsTerritorialAdminAndAssignedCountry, IsChefDeptTech
-from importer.utils.functions import open_excel_csv
+from importer.utils.functions import preview_excel_csv
 import pandas as pd
 
+import mimetypes
 import os
 
+
+def attachment_response(file_path, filename=None):
+    """
+    Returns a download response for a file stored under MEDIA_ROOT.
+
+    Behind nginx (SENDFILE_URL_PREFIX set), the body is left empty and nginx sends the
+    file itself via X-Accel-Redirect. Otherwise a FileResponse is returned so the WSGI
+    server can use wsgi.file_wrapper.
+    """
+    filename = filename or os.path.basename(file_path)
+    prefix = getattr(settings, 'SENDFILE_URL_PREFIX', None)
+    if prefix:
+        relative_path = os.path.relpath(file_path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f"{prefix.rstrip('/')}/{relative_path}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    return FileResponse(open(file_path, 'rb'), as_attachment=True, filename=filename)
+
+
+def paginated_response(view, queryset, serialize):
+    """
+    Serializes a list queryset with `serialize`, paginated with the view's pagination_class
+    when the client sends ?limit=&offset=. Without a limit, the full list is returned as before.
+    """
+    paginator = view.pagination_class()
+    page = paginator.paginate_queryset(queryset, view.request, view=view)
+    if page is None:
+        return Response(serialize(queryset))
+    return paginator.get_paginated_response(serialize(page))
+
+
 class FileListView(APIView):
     permission_classes = [IsAuthenticated, IsTerritorialAdminAndAssignedCountry|IsChefDeptTech]
+    pagination_class = LimitOffsetPagination
     
     def get(self, request):
-        files = File.objects.filter(country=request.user.country).order_by("-uploaded_at")        
-        serializer = FileSerializer(files, many=True)
-        return Response(serializer.data)
+        files = File.objects.filter(country=request.user.country).order_by("-uploaded_at").values(*FILE_LIST_VALUES)
+        return paginated_response(self, files, serialize_file_rows)
     
 
 class FileDeleteView(APIView):
@@ -33,14 +70,15 @@ class FileDeleteView(APIView):
             return Response({"detail": "Vous n'avez pas la permission d'effectuer cette action."},status=status.HTTP_403_FORBIDDEN)
         delete_claims = request.data.get('delete_claims', False)
 
-        if delete_claims:
-            deleted_count, _ = Claim.objects.filter(file=file).delete()
-            msg = f"{deleted_count} sinistres supprimés liés au fichier."
-        else:
-            Claim.objects.filter(file=file).update(file=None)
-            msg = "Référence au fichier retirée des sinistres."
+        # Claim.file is on_delete=SET_NULL: file.delete() already detaches the remaining claims
+        with transaction.atomic():
+            if delete_claims:
+                deleted_count, _ = Claim.objects.filter(file=file).delete()
+                msg = f"{deleted_count} sinistres supprimés liés au fichier."
+            else:
+                msg = "Référence au fichier retirée des sinistres."
 
-        file.delete()
+            file.delete()
         return Response({"detail": f"Fichier supprimé avec succès. {msg}"}, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -51,8 +89,7 @@ class FileDownloadView(APIView):
         file = get_object_or_404(File, pk=pk)
         if request.user != file.user and not getattr(request.user, 'is_admin_territorial', False):
             return Response({"detail": "Vous n'avez pas la permission d'effectuer cette action."},status=status.HTTP_403_FORBIDDEN)
-        file_path = file.file.path
-        return FileResponse(open(file_path, 'rb'), as_attachment=True)
+        return attachment_response(file.file.path)
     
 
 class FilePreviewView(APIView):
@@ -62,12 +99,9 @@ class FilePreviewView(APIView):
         file = get_object_or_404(File, pk=pk)
         if request.user != file.user and not getattr(request.user, 'is_admin_territorial', False):
             return Response({"detail": "Vous n'avez pas la permission d'effectuer cette action."},status=status.HTTP_403_FORBIDDEN)
-        df = open_excel_csv(file.file)
+        preview, total_rows, total_columns = preview_excel_csv(file.file, nrows=10, file_type=file.file_type)
         
-        first_10_rows = df.head(10).to_dict(orient='records')
-
-        total_rows = df.shape[0]
-        total_columns = df.shape[1]
+        first_10_rows = preview.to_dict(orient='records')
         
         return Response({
             'preview': first_10_rows,
@@ -81,11 +115,18 @@ class FilePreviewView(APIView):
 
 class ImportSessionListView(APIView):
     permission_classes = [IsAuthenticated, IsTerritorialAdminAndAssignedCountry|IsChefDeptTech]
+    pagination_class = LimitOffsetPagination
     
     def get(self, request):
-        import_sessions = ImportSession.objects.filter(country=request.user.country).order_by("-created_at")
-        serializer = ImportSessionSerializer(import_sessions, many=True, context={'request': request})
-        return Response(serializer.data)
+        import_sessions = ImportSession.objects.filter(country=request.user.country).select_related(
+            'user', 'country',
+            'stat_file', 'stat_file__user', 'stat_file__country',
+            'recap_file', 'recap_file__user', 'recap_file__country',
+        ).order_by("-created_at")
+        return paginated_response(
+            self, import_sessions,
+            lambda sessions: ImportSessionSerializer(sessions, many=True, context={'request': request}).data
+        )
     
 
 class ImportSessionDownloadView(APIView):
@@ -102,12 +143,12 @@ class ImportSessionDownloadView(APIView):
         if file_type == 'error':
             if not session.error_file:
                 raise Http404("Aucun fichier d’erreur disponible pour cette session.")
-            return FileResponse(session.error_file.open('rb'), as_attachment=True)
+            return attachment_response(session.error_file.path)
 
         elif file_type == 'log':
             if not session.log_file_path or not os.path.exists(session.log_file_path):
                 raise Http404("Aucun fichier de log disponible pour cette session.")
-            return FileResponse(open(session.log_file_path, 'rb'), as_attachment=True)
+            return attachment_response(session.log_file_path)
 
         return Response({"detail": "Paramètre 'type' invalide. Utilisez ?type=error ou ?type=log"},
                         status=status.HTTP_400_BAD_REQUEST)
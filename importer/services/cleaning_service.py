@@ -1,8 +1,12 @@
-from importer.utils.functions import (normalize_columns, replace_invalid_numeric_values, 
-clean_text_columns, convert_dates_datetime, convert_df_to_upper, export_invalid_date_rows
+from importer.utils.functions import (normalize_columns, coerce_numeric_columns,
+clean_upper_text_columns, convert_dates_datetime, convert_date_columns, export_invalid_date_rows,
+csv_dtypes, file_usecols
 )
+from importer.utils.constants import STAT_COLUMNS_TO_DROP
 import pandas as pd
 
+AMOUNT_COLUMNS = ['montant_facture', 'montant_rembourse', 'amount_claimed', 'amount_reimbursed']
+
 class CleaningService:
     @staticmethod
     def clean_recap_dataframe(df: pd.DataFrame) -> pd.DataFrame:
@@ -22,24 +26,20 @@ class CleaningService:
             pd.DataFrame: Cleaned and standardized DataFrame.
         """
         df = normalize_columns(df)
+        columns = frozenset(df.columns)
 
-        df.dropna(how='all')
-        df = df.drop_duplicates()
-
-        df = clean_text_columns(df)  
+        df = df.loc[df.notna().any(axis=1)].drop_duplicates()
 
-        for col in ['amount_claimed', 'amount_reimbursed']:
-            if col in df.columns:
-                replace_invalid_numeric_values(df, col)
+        df = coerce_numeric_columns(df, ['amount_claimed', 'amount_reimbursed'])
 
-        df = convert_df_to_upper(df)
+        df = clean_upper_text_columns(df)
 
         df = export_invalid_date_rows(df, 'payment_date', filename_prefix='recap_invalid_dates')
 
-        if 'payment_date' in df.columns:
+        if 'payment_date' in columns:
             df = convert_dates_datetime(df, 'payment_date', format='%d-%m-%Y')
 
-        if 'claim_id' in df.columns:
+        if 'claim_id' in columns:
             df = df[df['claim_id'].notna() & (df['claim_id'] != '')]
 
 
@@ -64,38 +64,80 @@ class CleaningService:
         Returns:
             pd.DataFrame: Cleaned and standardized DataFrame.
         """
-        df = normalize_columns(df)
+        df = CleaningService._clean_stat_rows(df)
+        return CleaningService._finalize_stat_dataframe(df)
 
+    @staticmethod
+    def clean_stat_chunks(file, chunksize: int = 100_000):
+        """
+        Reads a 'statistic' CSV file chunk by chunk and yields each chunk cleaned
+        with the row-local steps of `clean_stat_dataframe`.
+
+        Args:
+            file: The CSV file to read.
+            chunksize (int): Number of rows per chunk.
+
+        Yields:
+            pd.DataFrame: A cleaned chunk.
+        """
+        file.seek(0)
+        dtypes = csv_dtypes(file, 'stat')
+        for chunk in pd.read_csv(file, chunksize=chunksize, dtype=dtypes, usecols=file_usecols('stat')):
+            yield CleaningService._clean_stat_rows(chunk)
+
+    @staticmethod
+    def clean_stat_csv(file, chunksize: int = 100_000) -> pd.DataFrame:
+        """
+        Cleans a 'statistic' CSV file without materializing the raw file as a whole:
+        each chunk is cleaned as soon as it is read, then duplicates, invalid dates
+        and date conversion are handled once on the concatenated result. Peak memory is
+        the cleaned frame plus one raw chunk; the cleaned frame itself is still built whole.
+
+        Args:
+            file: The CSV file to read.
+            chunksize (int): Number of rows per chunk.
 
-        df = df.dropna(how='all')
+        Returns:
+            pd.DataFrame: Cleaned and standardized DataFrame.
+        """
+        df = pd.concat(CleaningService.clean_stat_chunks(file, chunksize), ignore_index=True)
         df = df.drop_duplicates()
+        return CleaningService._finalize_stat_dataframe(df)
+
+    @staticmethod
+    def _clean_stat_rows(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Row-local cleaning steps of the 'statistic' DataFrame, which can be applied chunk by chunk.
+        """
+        df = normalize_columns(df)
 
 
-        columns_to_drop = [
-            'unnamed_1', 'broker_name', 'broker_sunuid', 'adresse_du_partenaire'
-        ]
-        existing_columns = [col for col in columns_to_drop if col in df.columns]
+        df = df.loc[df.notna().any(axis=1)].drop_duplicates()
 
 
-        df = df.drop(columns=existing_columns)
+        df = df.drop(columns=df.columns.intersection(STAT_COLUMNS_TO_DROP))
 
-        for col in ['montant_facture', 'montant_rembourse', 'amount_claimed', 'amount_reimbursed']:
-            if col in df.columns:
-                replace_invalid_numeric_values(df, col)
+        df = coerce_numeric_columns(df, AMOUNT_COLUMNS)
 
-        df = clean_text_columns(df)
+        df = clean_upper_text_columns(df)
 
-        df = convert_df_to_upper(df)
+        return df
+
+    @staticmethod
+    def _finalize_stat_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cleaning steps of the 'statistic' DataFrame that need all rows at once.
+        """
+        columns = frozenset(df.columns)
 
         df = export_invalid_date_rows(df, 'payment_date', filename_prefix='stat_invalid_dates')
 
-        for col in ['date_de_reglement', 'date_de_sinistre', 'payment_date', 'incident_date']:
-            if col in df.columns:
-                df = convert_dates_datetime(df, col, format='%d/%m/%Y')
+        df = convert_date_columns(
+            df, ['date_de_reglement', 'date_de_sinistre', 'payment_date', 'incident_date'], format='%d/%m/%Y'
+        )
 
 
-        if 'claim_id' in df.columns:
+        if 'claim_id' in columns:
             df = df[df['claim_id'].notna() & (df['claim_id'] != '')]
 
         return df
-
@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
-from importer.utils.functions import (get_date_range, get_common_date_range, group_statistic_by_sinistre,
-                            convert_to_upper, check_conformity, delete_conform_rows, generate_observation
+from importer.utils.functions import (get_date_range, get_common_date_range, filter_date_range, group_statistic_by_sinistre,
+                            convert_to_upper, compute_conformity, generate_observations
  )
 class ComparisonService:
     @staticmethod
@@ -26,6 +27,25 @@ class ComparisonService:
 
         return common_range
 
+    @staticmethod
+    def filter_common_range(df_stat, df_recap, common_range):
+        """
+        Restricts both DataFrames to the common payment date range, once, so that the
+        comparison and export steps can reuse the filtered slices.
+
+        Args:
+            df_stat (pd.DataFrame): The 'statistic' DataFrame.
+            df_recap (pd.DataFrame): The 'recap' DataFrame.
+            common_range (tuple): A tuple containing the common date range (start, end).
+
+        Returns:
+            tuple: The filtered 'statistic' and 'recap' DataFrames.
+        """
+        return (
+            filter_date_range(df_stat, 'payment_date', common_range),
+            filter_date_range(df_recap, 'payment_date', common_range),
+        )
+
     @staticmethod
     def rename_recap_columns(df_recap):
         """
@@ -45,11 +65,12 @@ class ComparisonService:
         return df_recap
 
     @staticmethod
-    def compare_dataframes(df_stat, df_recap, common_range):      
+    def compare_dataframes(df_stat, df_recap):      
         """
-        Compares two DataFrames for conformity based on a common date range.
+        Compares two DataFrames, already restricted to their common date range
+        (see `filter_common_range`), for conformity.
 
-        Filters and processes the 'statistic' and 'recap' DataFrames to identify
+        Processes the 'statistic' and 'recap' DataFrames to identify
         differences in claimed and reimbursed amounts. The function groups the
         statistic data by claim, converts claim IDs to uppercase for consistency,
         and merges the data on claim IDs. It calculates the differences in billed
@@ -58,8 +79,6 @@ class ComparisonService:
         Args:
             df_stat (pd.DataFrame): The 'statistic' DataFrame containing claim details.
             df_recap (pd.DataFrame): The 'recap' DataFrame containing additional claim details.
-            common_range (tuple): A tuple containing the common date range (start, end)
-                for filtering the data.
 
         Returns:
             pd.DataFrame: A DataFrame containing the compared results with columns
@@ -67,13 +86,9 @@ class ComparisonService:
             conformity status.
         """
 
-        filtered_df_stat = df_stat[(df_stat['payment_date'] >= common_range[0]) & (df_stat['payment_date'] <= common_range[1])]
-        filtered_df_recap = df_recap[(df_recap['payment_date'] >= common_range[0]) & (df_recap['payment_date'] <= common_range[1])]
-
-
-        df_stat_grouped = group_statistic_by_sinistre(filtered_df_stat)
+        df_stat_grouped = group_statistic_by_sinistre(df_stat)
         df_stat_grouped = convert_to_upper(df_stat_grouped, "claim_id")
-        filtered_df_recap = convert_to_upper(filtered_df_recap, "claim_id")
+        filtered_df_recap = convert_to_upper(df_recap, "claim_id")
 
         filtered_df_recap = filtered_df_recap.rename(columns={
             'amount_claimed': 'amount_claimed_recap',
@@ -86,35 +101,47 @@ class ComparisonService:
             raise ValueError(f"Missing required columns in df_stat_grouped: {missing_columns}")
 
 
+        # Dictionary-encode claim_id with shared categories so the join hashes integer codes
+        claim_id_dtype = pd.CategoricalDtype(categories=pd.unique(np.concatenate([
+            df_stat_grouped["claim_id"].to_numpy(dtype=object),
+            filtered_df_recap["claim_id"].to_numpy(dtype=object),
+        ])))
+        df_stat_grouped["claim_id"] = df_stat_grouped["claim_id"].astype(claim_id_dtype)
+        filtered_df_recap["claim_id"] = filtered_df_recap["claim_id"].astype(claim_id_dtype)
+
         df_comparison = pd.merge(
             df_stat_grouped, 
             filtered_df_recap, 
             on="claim_id", 
             how="inner",
-            suffixes=('', '_recap')
+            suffixes=('', '_recap'),
+            sort=False
         )
+        df_comparison["claim_id"] = df_comparison["claim_id"].astype(object)
 
-        df_comparison["billed_amount_diff"] = df_comparison["amount_claimed"] - df_comparison["amount_claimed_recap"]
-        df_comparison["reimbursement_amount_diff"] = df_comparison["amount_reimbursed"] - df_comparison["amount_reimbursed_recap"]
-
-        
-        required_after_merge = ["amount_claimed", "amount_claimed_recap", 
-                              "amount_reimbursed", "amount_reimbursed_recap"]
-        missing_after_merge = [col for col in required_after_merge if col not in df_comparison.columns]
+        amount_columns = ["amount_claimed", "amount_claimed_recap",
+                          "amount_reimbursed", "amount_reimbursed_recap"]
+        missing_after_merge = [col for col in amount_columns if col not in df_comparison.columns]
         
         if missing_after_merge:
             raise ValueError(f"Missing required columns after merge: {missing_after_merge}")
 
+        # CleaningService already yields float64 amounts; only coerce columns that are not
+        for col in amount_columns:
+            if not pd.api.types.is_float_dtype(df_comparison[col]):
+                coerced = pd.to_numeric(df_comparison[col], errors='coerce')
+                non_numeric = coerced.isna() & df_comparison[col].notna()
+                if non_numeric.any():
+                    print(f"\n=== WARNING: Non-numeric values found in {col} ===")
+                    print(df_comparison[non_numeric][['claim_id', col]].head())
+                df_comparison[col] = coerced.astype('float64')
 
-        for col in ['amount_claimed', 'amount_claimed_recap', 'amount_reimbursed', 'amount_reimbursed_recap']:
-            non_numeric = pd.to_numeric(df_comparison[col], errors='coerce').isna()
-            if non_numeric.any():
-                print(f"\n=== WARNING: Non-numeric values found in {col} ===")
-                print(df_comparison[non_numeric][['claim_id', col]].head())
-                df_comparison[col] = pd.to_numeric(df_comparison[col], errors='coerce').fillna(0)
+        amounts = {col: df_comparison[col].to_numpy() for col in amount_columns}
+        df_comparison["billed_amount_diff"] = np.subtract(amounts["amount_claimed"], amounts["amount_claimed_recap"])
+        df_comparison["reimbursement_amount_diff"] = np.subtract(amounts["amount_reimbursed"], amounts["amount_reimbursed_recap"])
+        df_comparison[amount_columns] = df_comparison[amount_columns].fillna(0)
 
-
-        df_comparison["conformity"] = df_comparison.apply(check_conformity, axis=1)
+        df_comparison["conformity"] = compute_conformity(df_comparison)
 
         return df_comparison
 
@@ -132,21 +159,21 @@ class ComparisonService:
         Returns:
             tuple: A tuple containing the non-conforming DataFrame and the conforming DataFrame.
         """
-        df_non_conformes = df_comparaison[df_comparaison['conformity'] == 'Non conforme'].copy()
-        df_conformes = df_comparaison[df_comparaison['conformity'] == 'Conforme'].copy()
+        is_conforme = (df_comparaison['conformity'] == 'Conforme').to_numpy()
+        # Non-conforming rows whose amounts match exactly are reclassified as conforming
+        amounts_match = (
+            (df_comparaison['amount_claimed'] == df_comparaison['amount_claimed_recap']) &
+            (df_comparaison['amount_reimbursed'] == df_comparaison['amount_reimbursed_recap'])
+        ).to_numpy()
+        # La colonne conformity ne contient que ces deux valeurs (voir compute_conformity)
+        is_non_conforme = ~is_conforme
+
+        df_conformes = df_comparaison[is_conforme | (is_non_conforme & amounts_match)]
+        df_conformes = df_conformes[~df_conformes['claim_id'].duplicated()].copy()
+        df_non_conformes = df_comparaison[is_non_conforme & ~amounts_match].copy()
 
         if not df_non_conformes.empty:
-            deleted_conformes = df_non_conformes[
-                (df_non_conformes['amount_claimed'] == df_non_conformes['amount_claimed_recap']) &
-                (df_non_conformes['amount_reimbursed'] == df_non_conformes['amount_reimbursed_recap'])
-            ]
-
-            df_non_conformes = delete_conform_rows(df_non_conformes)
-
-            df_conformes = pd.concat([df_conformes, deleted_conformes]).drop_duplicates(subset=["claim_id"])
-
-            if not df_non_conformes.empty:
-                df_non_conformes['observation'] = df_non_conformes.apply(generate_observation, axis=1)
+            df_non_conformes['observation'] = generate_observations(df_non_conformes)
         
         return df_non_conformes, df_conformes
 
@@ -156,9 +183,9 @@ class ComparisonService:
         Exports the results of the comparison.
 
         Args:
-            df_stat (pd.DataFrame): The 'statistic' DataFrame containing claim details.
-            common_range (tuple): A tuple containing the common date range (start, end)
-                for filtering the data.
+            df_stat (pd.DataFrame): The 'statistic' DataFrame, already restricted to
+                the common date range (see `filter_common_range`).
+            common_range (tuple): A tuple containing the common date range (start, end).
             df_non_conformes (pd.DataFrame): The DataFrame containing non-conforming claims.
             df_conformes (pd.DataFrame): The DataFrame containing conforming claims.
 
@@ -166,9 +193,8 @@ class ComparisonService:
             dict: A dictionary containing the non-conforming DataFrame, the conforming DataFrame,
             and the common date range.
         """
-        conform_claim_ids = df_conformes['claim_id'].unique()
-        df_stat_filtered = df_stat[(df_stat['payment_date'] >= common_range[0]) & (df_stat['payment_date'] <= common_range[1])]
-        df_final_conformes = df_stat_filtered[df_stat_filtered['claim_id'].isin(conform_claim_ids)].copy()
+        conform_claim_ids = pd.Index(df_conformes['claim_id'].unique())
+        df_final_conformes = df_stat[df_stat['claim_id'].isin(conform_claim_ids)].copy()
         
         return {
             "non_conformes": df_non_conformes,
@@ -1,16 +1,144 @@
+import os
+from itertools import islice
+
 import pandas as pd
 
+from django.db import connection, transaction
+
 from core.models import (
     Client, Policy, Insured, Invoice, Partner, InsuredEmployer,
     PaymentMethod, Operator, Claim, Act, ActFamily, ActCategory
 )
 from users.models import Country
-from datetime import datetime
-from django.utils.timezone import make_aware, is_naive
+from django.utils import timezone
 from importer.services.logging_service import ImportLoggerService
 
+BULK_BATCH_SIZE = 1000
+
+# Libellés de référentiel : une valeur non textuelle donne un libellé vide
+LABEL_COLUMNS = ("act_category", "act_family", "act_name", "modified_by")
+# Noms et identifiants : seules les valeurs textuelles sont normalisées
+NAME_COLUMNS = (
+    "beneficiary_name", "main_insured", "insured_status",
+    "employer_name", "policy_number", "partner_name",
+)
+DATE_COLUMNS = ("payment_date", "incident_date")
+# Colonnes lues par le mapping, ajoutées vides si le fichier ne les contient pas
+MAPPED_COLUMNS = LABEL_COLUMNS + NAME_COLUMNS + DATE_COLUMNS + (
+    "claim_id", "claim_status", "partner_country", "payment_method", "invoice_number",
+)
+REQUIRED_COLUMNS = ("beneficiary_name", "claim_id")
+CATEGORY_COLUMNS = (
+    "act_category", "act_family", "insured_status",
+    "claim_status", "payment_method", "partner_country", "modified_by",
+)
+# Champs d'un sinistre remplacés lorsqu'il existe déjà (les defaults de l'ancien update_or_create)
+CLAIM_UPDATE_FIELDS = [
+    "status", "claim_date", "settlement_date", "invoice", "act",
+    "operator", "insured", "partner", "policy", "file",
+]
+
+
+def parse_dates(values, tz):
+    """
+    Parses a whole date column into timezone-aware timestamps in one vectorized pass.
+
+    Accepts the formats previously handled value by value by the mapper: datetimes,
+    date strings (month first, or ISO) and Excel serial numbers. Unparseable values give NaT.
+
+    Args:
+        values (pandas.Series): The raw date column.
+        tz (tzinfo): Time zone applied to the parsed dates, resolved once by the caller.
+
+    Returns:
+        pandas.Series: The parsed column, aware in the given time zone.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = values
+    else:
+        values = values.astype(object)
+        serials = pd.to_numeric(values, errors="coerce")
+        dates = pd.to_datetime(values.mask(serials.notna()), errors="coerce", format="mixed")
+        dates = dates.fillna(pd.to_datetime(serials, unit="D", origin="1899-12-30", errors="coerce"))
+
+    if dates.dt.tz is None:
+        return dates.dt.tz_localize(tz, nonexistent="shift_forward", ambiguous="NaT")
+    return dates.dt.tz_convert(tz)
+
+
+def clean_invoice_numbers(values):
+    """
+    Normalizes a whole invoice number column: missing values become "", integral floats
+    (as read from Excel) lose their ".0", and everything is uppercased and stripped.
+
+    Args:
+        values (pandas.Series): The raw invoice number column.
+
+    Returns:
+        pandas.Series: The cleaned invoice numbers, as strings.
+    """
+    values = values.astype(object)
+    cleaned = values.astype(str).str.upper().str.strip()
+
+    floats = pd.to_numeric(values.where(values.map(lambda value: isinstance(value, float))), errors="coerce")
+    integral = floats.notna() & floats.mod(1).eq(0)
+    cleaned[integral] = floats[integral].astype("int64").astype(str)
+    cleaned[values.isna()] = ""
+    return cleaned
+
+
+def normalize_strings(values, default=None):
+    """
+    Strips and uppercases the string values of a whole column.
+
+    Only the string values go through the `.str` accessor, which raises on a column holding
+    no string at all (an empty optional column, numeric identifiers). The other values are
+    kept as they are, or replaced with `default` when it is given.
+
+    Args:
+        values (pandas.Series): The raw column.
+        default (str, optional): Replacement for the non-string values.
+
+    Returns:
+        pandas.Series: The normalized column, as objects.
+    """
+    values = values.astype(object)
+    is_text = values.map(type).eq(str)
+    if default is not None:
+        values[~is_text] = default
+    if is_text.any():
+        values[is_text] = values[is_text].str.strip().str.upper().to_numpy()
+    return values
+
+
+def claim_status_codes(values):
+    """
+    Projects a whole claim status column on its one-letter codes (first character of the status).
+    Missing, empty and non-string statuses give " ".
+
+    Args:
+        values (pandas.Series): The claim status column.
+
+    Returns:
+        pandas.Series: The status codes, as objects.
+    """
+    values = values.astype(object)
+    is_text = values.map(type).eq(str)
+    codes = pd.Series(" ", index=values.index, dtype=object)
+    if is_text.any():
+        codes[is_text] = values[is_text].str[0].fillna(" ").to_numpy()
+    return codes
+
+
+def column_values(df, column):
+    """
+    Returns a column of the DataFrame, or an empty (all-None) column if it is missing.
+    """
+    return df.get(column, pd.Series(None, index=df.index, dtype=object))
+
+
 class DataMapper:
-    def __init__(self, df_stat, import_session):
+    def __init__(self, df_stat, import_session, logger_service=None):
         """
         Initialize a DataMapper object.
 
@@ -18,6 +146,9 @@ class DataMapper:
             df_stat (pandas.DataFrame): Dataframe containing the stat data
             import_session (File): The import session object associated
                 with this data mapper.
+            logger_service (ImportLoggerService, optional): Logger of the calling task.
+                When omitted, the mapper opens the session's logger and closes it
+                at the end of map_data.
         """
         self.df_stat = df_stat
         self.import_session = import_session
@@ -25,14 +156,33 @@ class DataMapper:
         self.file = import_session.stat_file 
         self.user = import_session.user
         
-        # Initialisation du logger
-        self.logger_service = ImportLoggerService(import_session.id)
+        # Initialisation du logger (celui de la tâche appelante s'il est fourni)
+        self.owns_logger = logger_service is None
+        self.logger_service = logger_service or ImportLoggerService.for_session(import_session.id)
         
-        # Lists pour tracking
+        # Les succès ne sont journalisés que pour une ligne sur log_every (~200 par étape) ;
+        # les erreurs et avertissements le sont toujours
+        self.log_every = max(1, len(df_stat) // 200)
+
+        # Table des pays (petite et statique) chargée une fois, clé en minuscules
+        # comme le name__iexact utilisé auparavant pour chaque partenaire
+        countries = list(Country.objects.all())
+        self.countries_by_name = {country.name.lower(): country for country in countries}
+        # Pays de repli de l'utilisateur, résolu une fois depuis la même table
+        self.user_country = next(
+            (country for country in countries if country.id == self.user.country_id), None
+        )
+
+        # Lists pour tracking ; les erreurs sont des tuples (étape, ligne, message),
+        # mis en forme une seule fois pour le rapport final (voir format_errors)
         self.logs = []
         self.orphan_claims = []
         self.errors = []
 
+        # Caches des référentiels, remplis par preload_reference_objects
+        # puis complétés par les get_or_create_* à chaque objet manquant
+        self.clear_caches()
+
     def map_data(self):
         """
         Map the data from the stat file to the database avec logging détaillé.
@@ -46,9 +196,7 @@ class DataMapper:
                 "pays": self.country.name if hasattr(self.country, 'name') else str(self.country)
             })
             
-            df = self.df_stat.copy()
             insured_dict = {}
-            insured_employer_dict = {}
             
             # Compteurs
             insured_created = 0
@@ -59,14 +207,46 @@ class DataMapper:
 
             # Nettoyage des données
             self.logger_service.log_step_start("Nettoyage des données", 1)
-            original_rows = len(df)
-            original_cols = len(df.columns)
-            
-            df = df.dropna(how='all', axis=1)
-            df = df.dropna(how='all', axis=0)
-            
-            cleaned_rows = len(df)
+            original_rows = len(self.df_stat)
+            original_cols = len(self.df_stat.columns)
+
+            # Lignes et colonnes vides retirées en une passe : un seul masque isna et une seule copie
+            # (au lieu de deux dropna successifs)
+            empty = self.df_stat.isna()
+            df = self.df_stat.loc[~empty.all(axis=1), ~empty.all(axis=0)]
+            del empty
             cleaned_cols = len(df.columns)
+
+            # Les colonnes lues par le mapping sont toujours présentes (une colonne vide
+            # vient d'être supprimée), ce qui évite les accès défensifs ligne par ligne
+            df = df.reindex(columns=df.columns.union(pd.Index(MAPPED_COLUMNS), sort=False))
+
+            # Les lignes sans bénéficiaire ou sans identifiant de sinistre échouaient à
+            # chaque étape : elles sont écartées une fois, avec un seul message
+            incomplete = df[list(REQUIRED_COLUMNS)].isna().any(axis=1)
+            if incomplete.any():
+                self.logger_service.log_warning("Lignes ignorées : bénéficiaire ou identifiant de sinistre manquant", {
+                    "lignes": df.index[incomplete].tolist()
+                })
+                self.errors.append((
+                    "NETTOYAGE", None,
+                    f"{int(incomplete.sum())} lignes sans bénéficiaire ou identifiant de sinistre ignorées"
+                ))
+                df = df.loc[~incomplete]
+
+            df = self.normalize_text_columns(df)
+            df["invoice_number"] = clean_invoice_numbers(df["invoice_number"])
+            current_tz = timezone.get_current_timezone()
+            for column in DATE_COLUMNS:
+                df[column] = parse_dates(df[column], current_tz)
+
+            # Code statut du sinistre (première lettre, " " si absent), projeté sur toute la colonne
+            df["claim_status"] = claim_status_codes(df["claim_status"])
+
+            # Colonnes à faible cardinalité stockées en category : un code entier par ligne
+            df = df.astype({column: "category" for column in CATEGORY_COLUMNS})
+
+            cleaned_rows = len(df)
             
             self.logger_service.log_step_end("Nettoyage des données", True, {
                 "lignes_supprimées": original_rows - cleaned_rows,
@@ -74,312 +254,325 @@ class DataMapper:
                 "lignes_restantes": cleaned_rows
             })
 
-            # ÉTAPE 1: Création des objets de base
-            self.logger_service.log_step_start("Création des objets de base (catégories, familles, actes, etc.)", 2)
-            step1_errors = 0
-            
-            for index, row in df.iterrows():
-                try:
-                    self.logger_service.log_info(f"Traitement ligne {index}", {
-                        "beneficiary_name": row.get("beneficiary_name", "N/A"),
-                        "act_category": row.get("act_category", "N/A"),
-                        "act_family": row.get("act_family", "N/A")
-                    })
-
-                    cat = self.get_or_create_category(row["act_category"])
-                    fam = self.get_or_create_family(row["act_family"], cat)
-                    act = self.get_or_create_act(row["act_name"], fam)
-                    partner = self.get_or_create_partner(row["partner_name"], row["partner_country"])
-                    payment_method = self.get_or_create_payment_method(row["payment_method"], row["payment_date"], partner)
-                    operator = self.get_or_create_operator(row["modified_by"])
-                    client = self.get_or_create_client(row["employer_name"])
-                    policy = self.get_or_create_policy(row["policy_number"], client)
-
-                    self.logger_service.log_info(f"✅ Ligne {index} traitée avec succès", {
-                        "category": cat.label,
-                        "family": fam.label,
-                        "act": act.label,
-                        "partner": partner.name,
-                        "client": client.name,
-                        "policy": policy.policy_number
-                    })
-
-                except Exception as e:
-                    step1_errors += 1
-                    self.logger_service.log_error(
-                        f"Erreur lors du traitement des objets de base",
-                        details={
-                            "beneficiary_name": row.get("beneficiary_name", "N/A"),
-                            "act_category": row.get("act_category", "N/A"),
-                            "partner_name": row.get("partner_name", "N/A")
-                        },
-                        line_index=index,
-                        exception=e
-                    )
-                    self.errors.append(f"[ÉTAPE 1 - ligne {index}] {str(e)}")
-
-            self.logger_service.log_step_end("Création des objets de base", step1_errors == 0, {
-                "erreurs": step1_errors,
-                "lignes_traitées": len(df)
-            })
+            # Une seule transaction pour tout le mapping au lieu d'un commit par get_or_create ;
+            # les créations unitaires restent protégées par leur propre savepoint (get_or_create).
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    # Les contrôles de clés étrangères sont faits une seule fois, au commit
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+                # ÉTAPE 1: Création des objets de base, en bulk (les moyens de paiement
+                # sont créés en bulk avec les sinistres, à l'étape 5)
+                self.logger_service.log_step_start("Création des objets de base (catégories, familles, actes, etc.)", 2)
+                self.preload_reference_objects(df)
+                self.logger_service.log_step_end("Création des objets de base", True, {
+                    "catégories": len(self.categories),
+                    "familles": len(self.families),
+                    "actes": len(self.acts),
+                    "opérateurs": len(self.operators),
+                    "clients": len(self.clients),
+                    "polices": len(self.policies),
+                    "partenaires": len(self.partners)
+                })
 
-            # ÉTAPE 2: Création des assurés principaux
-            self.logger_service.log_step_start("Création des assurés principaux", 3)
-            df_primary = df[df["insured_status"].str.upper() == "A"]
-            step2_errors = 0
-            
-            for index, row in df_primary.iterrows():
-                try:
-                    name = row["beneficiary_name"]
-                    insured = self.get_or_create_primary_insured(name, row["insured_status"], row["incident_date"])
-                    
-                    if insured:
-                        insured_dict[name.strip()] = insured
-                        insured_created += 1
-                        self.logger_service.log_info(f"✅ Assuré principal créé: {insured.name}", {
-                            "ligne": index,
-                            "status": row["insured_status"]
-                        })
-                    else:
-                        self.logger_service.log_warning(f"Assuré principal non créé", {
-                            "nom": name,
-                            "status": row["insured_status"]
-                        }, line_index=index)
-
-                except Exception as e:
+                # ÉTAPE 2: Création des assurés principaux
+                self.logger_service.log_step_start("Création des assurés principaux", 3)
+                # insured_status est déjà en majuscules (normalize_text_columns) et en category :
+                # les deux masques comparent des codes, sans repasser sur les chaînes
+                is_primary = df["insured_status"].eq("A")
+                is_dependent = df["insured_status"].isin(["C", "E"])
+                df_primary = df.loc[is_primary]
+                step2_errors = 0
+
+                # Un seul get_or_create en bulk par nom distinct, au lieu d'un par ligne
+                has_name = df_primary["beneficiary_name"].map(type).eq(str)
+                for row in df_primary.loc[~has_name].itertuples():
                     step2_errors += 1
                     self.logger_service.log_error(
                         f"Erreur création assuré principal",
-                        details={"nom": row.get('beneficiary_name', 'N/A')},
-                        line_index=index,
-                        exception=e
+                        details={"nom": row.beneficiary_name},
+                        line_index=row.Index
                     )
-                    self.errors.append(f"[ÉTAPE 2 - ligne {index}] {str(e)}")
+                    self.errors.append(("ÉTAPE 2", row.Index, f"Nom d'assuré invalide : {row.beneficiary_name!r}"))
 
-            self.logger_service.log_step_end("Création des assurés principaux", step2_errors == 0, {
-                "erreurs": step2_errors,
-                "assurés_créés": insured_created,
-                "lignes_traitées": len(df_primary)
-            })
+                insured_dict.update(self.bulk_get_or_create_insureds(
+                    dict.fromkeys(df_primary.loc[has_name, "beneficiary_name"], ("A", None))
+                ))
+                insured_created += int(has_name.sum())
 
-            # ÉTAPE 3: Création des assurés dépendants
-            self.logger_service.log_step_start("Création des assurés dépendants", 4)
-            df_dependents = df[df["insured_status"].str.upper().isin(["C", "E"])]
-            step3_errors = 0
-            
-            for index, row in df_dependents.iterrows():
-                try:
-                    name_primary = row["main_insured"]
-                    if name_primary not in insured_dict:
-                        self.logger_service.log_warning(
-                            f"Assuré principal manquant, création automatique",
-                            details={
-                                "nom_principal": name_primary,
-                                "dépendant": row["beneficiary_name"]
-                            },
-                            line_index=index
-                        )
-                        
-                        primary_insured = self.get_or_create_primary_insured(name_primary, "A", row["incident_date"])
-                        if primary_insured:
-                            insured_dict[name_primary.strip()] = primary_insured
-                            insured_created += 1
-
-                    name = row["beneficiary_name"]
-                    statut = row["insured_status"]
-                    principal_name = row["main_insured"]
-                    insured = self.get_or_create_dependent_insured(name, statut, principal_name, insured_dict, row["incident_date"])
-                    
-                    if insured:
-                        insured_dict[name.strip()] = insured
-                        insured_created += 1
-                        self.logger_service.log_info(f"✅ Assuré dépendant créé: {insured.name}", {
-                            "ligne": index,
-                            "status": statut,
-                            "principal": principal_name
-                        })
-
-                except Exception as e:
+                self.logger_service.log_step_end("Création des assurés principaux", step2_errors == 0, {
+                    "erreurs": step2_errors,
+                    "assurés_créés": insured_created,
+                    "lignes_traitées": len(df_primary)
+                })
+
+                # ÉTAPE 3: Création des assurés dépendants
+                self.logger_service.log_step_start("Création des assurés dépendants", 4)
+                df_dependents = df.loc[is_dependent]
+                step3_errors = 0
+
+                has_names = df_dependents[["beneficiary_name", "main_insured"]].apply(
+                    lambda s: s.map(type).eq(str)
+                ).all(axis=1)
+                for row in df_dependents.loc[~has_names].itertuples():
                     step3_errors += 1
                     self.logger_service.log_error(
                         f"Erreur création assuré dépendant",
                         details={
-                            "nom": row.get('beneficiary_name', 'N/A'),
-                            "principal": row.get('main_insured', 'N/A')
+                            "nom": row.beneficiary_name,
+                            "principal": row.main_insured
                         },
-                        line_index=index,
-                        exception=e
+                        line_index=row.Index
                     )
-                    self.errors.append(f"[ÉTAPE 3 - ligne {index}] {str(e)}")
+                    self.errors.append(("ÉTAPE 3", row.Index, "Nom d'assuré ou d'assuré principal invalide"))
+                df_dependents = df_dependents.loc[has_names]
 
-            self.logger_service.log_step_end("Création des assurés dépendants", step3_errors == 0, {
-                "erreurs": step3_errors,
-                "dépendants_créés": insured_created - len(df_primary),
-                "lignes_traitées": len(df_dependents)
-            })
+                missing_primaries = [
+                    name for name in df_dependents["main_insured"].unique() if name not in insured_dict
+                ]
+                for name in missing_primaries:
+                    self.logger_service.log_warning(
+                        f"Assuré principal manquant, création automatique",
+                        details={"nom_principal": name}
+                    )
+                insured_dict.update(self.bulk_get_or_create_insureds(dict.fromkeys(missing_primaries, ("A", None))))
+                insured_created += len(missing_primaries)
+
+                # Première ligne par nom : elle fixe le statut et l'assuré principal à la création
+                dependents = {}
+                for name, statut, principal_name in zip(
+                    df_dependents["beneficiary_name"],
+                    df_dependents["insured_status"].astype(object),
+                    df_dependents["main_insured"],
+                ):
+                    dependents.setdefault(name, (statut, insured_dict[principal_name]))
+                insured_dict.update(self.bulk_get_or_create_insureds(dependents))
+                insured_created += len(df_dependents)
+
+                self.logger_service.log_step_end("Création des assurés dépendants", step3_errors == 0, {
+                    "erreurs": step3_errors,
+                    "dépendants_créés": insured_created - len(df_primary),
+                    "lignes_traitées": len(df_dependents)
+                })
 
 
-            # ÉTAPE 4: Création des relations InsuredEmployer
-            self.logger_service.log_step_start("Création des relations Assuré-Employeur", 5)
-            step4_errors = 0
-            
-            for index, row in df.iterrows():
-                try:
-                    name = row["beneficiary_name"].strip()
-                    insured = insured_dict.get(name)
-                    
-                    if not insured:
-                        self.logger_service.log_error(
-                            f"Assuré introuvable pour la relation InsuredEmployer",
-                            details={
-                                "nom_recherché": name,
-                                "employer_name": row.get("employer_name", "N/A")
-                            },
-                            line_index=index
-                        )
-                        step4_errors += 1
-                        continue
+                # Résolution des assurés par nom, en une fois, pour les étapes 4 et 5
+                df["insured_obj"] = df["beneficiary_name"].astype(object).str.strip().map(insured_dict)
+                has_insured = df["insured_obj"].notna()
+                df_orphans = df[~has_insured]
+                df_insured = df[has_insured]
 
-                    client = self.get_or_create_client(row["employer_name"])
-                    policy = self.get_or_create_policy(row["policy_number"], client)
-                    
-                    # Créer la relation InsuredEmployer
-                    insured_employer = self.get_or_create_insured_employer(
-                        insured=insured,
-                        employer=client,
-                        policy=policy,
-                        status=row["insured_status"],
-                        insured_dict=insured_dict,
-                        main_insured_name=row.get("main_insured", ""),
-                        date=make_aware(row["incident_date"])
-                    )
-                    
-                    if insured_employer:
-                        # Créer une clé unique pour éviter les doublons
-                        ie_key = f"{insured.id}_{client.id}_{policy.id}"
-                        if ie_key not in insured_employer_dict:
-                            insured_employer_dict[ie_key] = insured_employer
-                            insured_employers_created += 1
-                            
-                        self.logger_service.log_info(f"✅ Relation InsuredEmployer créée", {
-                            "ligne": index,
-                            "assuré": insured.name,
-                            "employeur": client.name,
-                            "police": policy.policy_number,
-                            "role": insured_employer.role
-                        })
-
-                except Exception as e:
-                    step4_errors += 1
+                # ÉTAPE 4: Création des relations InsuredEmployer
+                self.logger_service.log_step_start("Création des relations Assuré-Employeur", 5)
+                step4_errors = len(df_orphans)
+
+                for row in df_orphans.itertuples():
                     self.logger_service.log_error(
-                        f"Erreur création relation InsuredEmployer",
+                        f"Assuré introuvable pour la relation InsuredEmployer",
                         details={
-                            "nom": row.get('beneficiary_name', 'N/A'),
-                            "employeur": row.get("employer_name", "N/A"),
-                            "police": row.get("policy_number", "N/A")
+                            "nom_recherché": row.beneficiary_name,
+                            "employer_name": row.employer_name
                         },
-                        line_index=index,
-                        exception=e
+                        line_index=row.Index
                     )
-                    self.errors.append(f"[ÉTAPE 4 - ligne {index}] {str(e)}")
 
-            self.logger_service.log_step_end("Création des relations Assuré-Employeur", step4_errors == 0, {
-                "erreurs": step4_errors,
-                "relations_créées": insured_employers_created,
-                "lignes_traitées": len(df)
-            })
+                # Une relation par triplet (assuré, employeur, police) distinct, créées ensemble en bulk
+                insured_employer_defaults = {}
+                for position, row in enumerate(df_insured.itertuples()):
+                    try:
+                        insured = row.insured_obj
+
+                        client = self.get_or_create_client(row.employer_name)
+                        policy = self.get_or_create_policy(row.policy_number, client)
+
+                        ie_key = (insured.id, client.id, policy.id)
+                        if ie_key in insured_employer_defaults:
+                            continue
+                        insured_employer_defaults[ie_key] = self.insured_employer_defaults(
+                            insured=insured,
+                            status=row.insured_status,
+                            insured_dict=insured_dict,
+                            main_insured_name=row.main_insured
+                        )
 
+                        if position % self.log_every == 0:
+                            self.logger_service.log_info(f"✅ Relation InsuredEmployer préparée", {
+                                "ligne": row.Index,
+                                "assuré": insured.name,
+                                "employeur": client.name,
+                                "police": policy.policy_number,
+                                "role": insured_employer_defaults[ie_key]["role"]
+                            })
 
-            # ÉTAPE 5: Création des sinistres et factures
-            self.logger_service.log_step_start("Création des sinistres et factures", 5)
-            step5_errors = 0
-            
-            for index, row in df.iterrows():
-                try:
-                    name = row["beneficiary_name"].strip()
-                    insured = insured_dict.get(name)
-                    
-                    if not insured:
+                    except Exception as e:
+                        step4_errors += 1
                         self.logger_service.log_error(
-                            f"Assuré introuvable pour le sinistre",
+                            f"Erreur création relation InsuredEmployer",
                             details={
-                                "nom_recherché": name,
-                                "claim_id": row.get("claim_id", "N/A"),
-                                "assurés_disponibles": list(insured_dict.keys())[:5]  # Limite à 5 pour lisibilité
+                                "nom": row.beneficiary_name,
+                                "employeur": row.employer_name,
+                                "police": row.policy_number
                             },
-                            line_index=index
+                            line_index=row.Index,
+                            exception=e
                         )
-                        raise Exception(f"Aucun assuré trouvé pour '{name}'")
-
-                    # Création des objets liés
-                    provider = self.get_or_create_partner(row["partner_name"], row["partner_country"])
-                    invoice = self.get_or_create_invoice(
-                        row["invoice_number"], 
-                        row["amount_claimed"], 
-                        row["amount_reimbursed"], 
-                        provider, 
-                        insured
-                    )
+                        self.errors.append(("ÉTAPE 4", row.Index, str(e)))
 
-                    cat = self.get_or_create_category(row["act_category"])
-                    fam = self.get_or_create_family(row["act_family"], cat)
-                    act = self.get_or_create_act(row["act_name"], fam)
-                    operator = self.get_or_create_operator(row["modified_by"])
-                    client = self.get_or_create_client(row["employer_name"])
-                    policy = self.get_or_create_policy(row["policy_number"], client)
-
-                    claim = self.get_or_create_claim(
-                        claim_id=row["claim_id"],
-                        status=row["claim_status"],
-                        date_claim=row["payment_date"],
-                        settlement_date=row["incident_date"],
-                        invoice=invoice,
-                        act=act,
-                        operator=operator,
-                        insured=insured,
-                        partner=provider,
-                        policy=policy,
-                    )
-                    
-                    if claim:
-                        claims_created += 1
-                        total_claimed += row["amount_claimed"] or 0
-                        total_reimbursed += row["amount_reimbursed"] or 0
-                        
-                        self.logger_service.log_info(f"✅ Sinistre créé: {claim.id}", {
-                            "ligne": index,
-                            "assuré": insured.name,
-                            "montant_réclamé": row["amount_claimed"],
-                            "montant_remboursé": row["amount_reimbursed"]
-                        })
-
-                except Exception as e:
-                    step5_errors += 1
+                _, insured_employers_created = self.bulk_get_or_create(
+                    InsuredEmployer, ("insured_id", "employer_id", "policy_id"), insured_employer_defaults,
+                    defaults=insured_employer_defaults
+                )
+
+                self.logger_service.log_step_end("Création des relations Assuré-Employeur", step4_errors == 0, {
+                    "erreurs": step4_errors,
+                    "relations_créées": insured_employers_created,
+                    "lignes_traitées": len(df)
+                })
+
+
+                # ÉTAPE 5: Création des sinistres et factures
+                self.logger_service.log_step_start("Création des sinistres et factures", 5)
+                step5_errors = len(df_orphans)
+                claims = {}
+                claim_invoices = {}
+                invoice_defaults = {}
+                payment_defaults = {}
+
+                # Limite à 5 pour lisibilité, calculé une fois pour tous les orphelins
+                available_insureds = list(islice(insured_dict, 5))
+                for row in df_orphans.itertuples():
+                    name = row.beneficiary_name
                     self.logger_service.log_error(
-                        f"Erreur création sinistre/facture",
+                        f"Assuré introuvable pour le sinistre",
                         details={
-                            "claim_id": row.get("claim_id", "N/A"),
-                            "beneficiary_name": row.get("beneficiary_name", "N/A"),
-                            "invoice_number": row.get("invoice_number", "N/A")
+                            "nom_recherché": name,
+                            "claim_id": row.claim_id,
+                            "assurés_disponibles": available_insureds
                         },
-                        line_index=index,
-                        exception=e
+                        line_index=row.Index
                     )
-                    self.errors.append(f"[ÉTAPE 5 - ligne {index}] {str(e)}")
+                    self.orphan_claims.append(row.claim_id)
+                    self.errors.append(("ÉTAPE 5", row.Index, f"Aucun assuré trouvé pour '{name}'"))
+
+                # Méthodes et attributs liés une fois : la boucle ne refait pas la résolution d'attribut par ligne
+                get_partner = self.get_or_create_partner
+                get_category = self.get_or_create_category
+                get_family = self.get_or_create_family
+                get_act = self.get_or_create_act
+                get_operator = self.get_or_create_operator
+                get_client = self.get_or_create_client
+                get_policy = self.get_or_create_policy
+                file = self.file
+
+                for position, row in enumerate(df_insured.itertuples()):
+                    try:
+                        insured = row.insured_obj
+
+                        # Création des objets liés
+                        provider = get_partner(row.partner_name, row.partner_country)
+                        try:
+                            # Moyens de paiement créés en bulk après la boucle : la première ligne fixe la date
+                            payment_key, payment_values = self.payment_method_defaults(
+                                row.payment_method, row.payment_date, provider
+                            )
+                            payment_defaults.setdefault(payment_key, payment_values)
+                        except Exception as e:
+                            # Un moyen de paiement invalide n'empêche pas la création du sinistre
+                            self.logger_service.log_error(
+                                f"Erreur création moyen de paiement",
+                                details={"payment_method": row.payment_method},
+                                line_index=row.Index,
+                                exception=e
+                            )
+                            self.errors.append(("ÉTAPE 5", row.Index, str(e)))
+
+                        # Factures créées en bulk après la boucle : la première ligne fixe les montants,
+                        # comme le faisait get_or_create
+                        invoice_key = (row.invoice_number, provider.id, insured.id)
+                        invoice_defaults.setdefault(invoice_key, dict(
+                            claimed_amount=row.amount_claimed,
+                            reimbursed_amount=row.amount_reimbursed,
+                            file=file
+                        ))
+
+                        cat = get_category(row.act_category)
+                        fam = get_family(row.act_family, cat)
+                        act = get_act(row.act_name, fam)
+                        operator = get_operator(row.modified_by)
+                        client = get_client(row.employer_name)
+                        policy = get_policy(row.policy_number, client)
+
+                        claim = self.build_claim(
+                            claim_id=row.claim_id,
+                            status=row.claim_status,
+                            date_claim=row.payment_date,
+                            settlement_date=row.incident_date,
+                            invoice=None,
+                            act=act,
+                            operator=operator,
+                            insured=insured,
+                            partner=provider,
+                            policy=policy,
+                        )
+                    
+                        if claim:
+                            # Une même ligne de sinistre répétée : la dernière l'emporte, comme avec update_or_create
+                            claims[claim.id] = claim
+                            claim_invoices[claim.id] = invoice_key
+                            claims_created += 1
+                            total_claimed += row.amount_claimed or 0
+                            total_reimbursed += row.amount_reimbursed or 0
+                        
+                            if position % self.log_every == 0:
+                                self.logger_service.log_info(f"✅ Sinistre créé: {claim.id}", {
+                                    "ligne": row.Index,
+                                    "assuré": insured.name,
+                                    "montant_réclamé": row.amount_claimed,
+                                    "montant_remboursé": row.amount_reimbursed
+                                })
+
+                    except Exception as e:
+                        step5_errors += 1
+                        self.logger_service.log_error(
+                            f"Erreur création sinistre/facture",
+                            details={
+                                "claim_id": row.claim_id,
+                                "beneficiary_name": row.beneficiary_name,
+                                "invoice_number": row.invoice_number
+                            },
+                            line_index=row.Index,
+                            exception=e
+                        )
+                        self.errors.append(("ÉTAPE 5", row.Index, str(e)))
+
+                invoices, _ = self.bulk_get_or_create(
+                    Invoice, ("invoice_number", "provider_id", "insured_id"), invoice_defaults,
+                    defaults=invoice_defaults
+                )
+                for claim_id, claim in claims.items():
+                    claim.invoice = invoices[claim_invoices[claim_id]]
+                self.save_claims(claims.values())
+                payment_methods, _ = self.bulk_get_or_create(
+                    PaymentMethod, ("payment_number", "provider_id"), payment_defaults,
+                    defaults=payment_defaults
+                )
+                self.payment_methods.update(payment_methods)
+
+                self.logger_service.log_step_end("Création des sinistres et factures", step5_errors == 0, {
+                    "erreurs": step5_errors,
+                    "sinistres_créés": claims_created,
+                    "moyens_de_paiement": len(payment_defaults),
+                    "total_réclamé": total_claimed,
+                    "total_remboursé": total_reimbursed
+                })
 
-            self.logger_service.log_step_end("Création des sinistres et factures", step5_errors == 0, {
-                "erreurs": step5_errors,
-                "sinistres_créés": claims_created,
-                "total_réclamé": total_claimed,
-                "total_remboursé": total_reimbursed
-            })
 
             # Mise à jour de la session d'import
             self.import_session.insured_created_count = insured_created
             self.import_session.claims_created_count = claims_created
             self.import_session.total_claimed_amount = total_claimed
             self.import_session.total_reimbursed_amount = total_reimbursed
-            self.import_session.save()
 
             # Résumé final
             self.logger_service.log_step_start("RÉSUMÉ FINAL DE L'IMPORT")
@@ -395,7 +588,7 @@ class DataMapper:
 
             if self.errors:
                 self.logger_service.log_warning(f"Import terminé avec {len(self.errors)} erreurs", {
-                    "liste_erreurs": self.errors
+                    "liste_erreurs": self.format_errors()
                 })
                 
         except Exception as e:
@@ -404,121 +597,252 @@ class DataMapper:
         finally:
             # Sauvegarde du chemin du fichier de log dans la session
             self.import_session.log_file_path = self.logger_service.get_log_file_path()
+            if self.owns_logger:
+                # Fichier complet seulement une fois le logger fermé (tampon vidé, fichier ouvert à la demande).
+                # Sinon c'est la tâche appelante qui renseigne log_file_exists après sa fermeture
+                self.logger_service.close()
+                self.import_session.log_file_exists = os.path.exists(self.import_session.log_file_path)
             self.import_session.save()
-            self.logger_service.close()
+            self.clear_caches()
 
 
 
 
-    def get_or_create_insured_employer(self, insured, employer, policy, status, insured_dict, main_insured_name, date):
+    def format_errors(self):
         """
-        Crée ou récupère une relation InsuredEmployer.
-        
+        Formats the error records collected in `self.errors` for the import report.
+
+        Returns:
+            list: One "[étape - ligne n] message" string per error.
+        """
+        return [
+            f"[{step} - ligne {line}] {message}" if line is not None else f"[{step}] {message}"
+            for step, line, message in self.errors
+        ]
+
+    def clear_caches(self):
+        """
+        Empties the reference object caches used by the get_or_create_* helpers.
+        """
+        self.categories = {}
+        self.families = {}
+        self.acts = {}
+        self.operators = {}
+        self.clients = {}
+        self.policies = {}
+        self.partners = {}
+        self.payment_methods = {}
+
+    @staticmethod
+    def normalize_text_columns(df):
+        """
+        Strips and uppercases the label and name columns once, on whole columns,
+        instead of once per row (and per helper call) in the mapping loops.
+
+        Args:
+            df (pandas.DataFrame): The stat data.
+
+        Returns:
+            pandas.DataFrame: The DataFrame with normalized text columns.
+        """
+        labels = df.columns.intersection(LABEL_COLUMNS)
+        if len(labels):
+            df[labels] = df[labels].apply(normalize_strings, default="")
+
+        names = df.columns.intersection(NAME_COLUMNS)
+        if len(names):
+            df[names] = df[names].apply(normalize_strings)
+        return df
+
+    @staticmethod
+    def bulk_get_or_create(model, fields, keys, defaults=None, **extra):
+        """
+        Retrieves or creates the `model` objects identified by `keys`, in bulk.
+
+        Existing objects are fetched with one query per BULK_BATCH_SIZE keys and the missing
+        ones are inserted with bulk_create, instead of one get_or_create per row. On backends
+        that cannot return primary keys from a bulk insert, the inserted rows are read back
+        so that every returned object has its pk.
+
+        Args:
+            model (Model): The model class.
+            fields (tuple): The lookup fields, e.g. ("label", "category_id").
+            keys (iterable): Tuples of values for `fields`.
+            defaults (dict): Optional field values, per key, only used to create the missing objects.
+            **extra: Lookup values shared by every key (e.g. country, file).
+
+        Returns:
+            tuple: The objects keyed by their tuple of `fields` values, and the number of
+                objects created by this call.
+        """
+        keys = list(set(keys))
+        if not keys:
+            return {}, 0
+
+        def fetch():
+            # Lots de clés : les listes IN restent sous la limite de paramètres du backend
+            objects = {}
+            for start in range(0, len(keys), BULK_BATCH_SIZE):
+                batch = keys[start:start + BULK_BATCH_SIZE]
+                lookup = {f"{field}__in": {key[i] for key in batch} for i, field in enumerate(fields)}
+                for obj in model.objects.filter(**lookup, **extra).order_by("pk"):
+                    objects.setdefault(tuple(getattr(obj, field) for field in fields), obj)
+            return objects
+
+        objects = fetch()
+        defaults = defaults or {}
+        missing = [
+            model(**dict(zip(fields, key)), **extra, **defaults.get(key, {}))
+            for key in keys if key not in objects
+        ]
+        if not missing:
+            return objects, 0
+
+        created = model.objects.bulk_create(missing, batch_size=BULK_BATCH_SIZE)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # Pas de RETURNING : relecture des lignes insérées pour récupérer leurs pk
+            return fetch(), len(created)
+        for obj in created:
+            objects.setdefault(tuple(getattr(obj, field) for field in fields), obj)
+        return objects, len(created)
+
+    def preload_reference_objects(self, df):
+        """
+        Loads the categories, families, acts, operators, clients, policies and partners
+        referenced by the stat file into the mapper caches, with a few queries and bulk inserts
+        per model (see `bulk_get_or_create`). The get_or_create_* helpers then resolve them from memory.
+
+        Args:
+            df (pandas.DataFrame): The cleaned stat data.
+        """
+        # Les clés distinctes sont extraites par pandas : seules elles sont parcourues en Python.
+        # Les libellés n'ont plus de valeurs manquantes (normalize_text_columns les remplace par "")
+        act_keys = pd.DataFrame({
+            "category": column_values(df, "act_category"),
+            "family": column_values(df, "act_family"),
+            "act": column_values(df, "act_name"),
+        }).drop_duplicates()
+
+        self.categories, _ = self.bulk_get_or_create(ActCategory, ("label",), zip(act_keys["category"].unique()))
+        act_keys["category_id"] = [self.categories[(label,)].id for label in act_keys["category"]]
+
+        self.families, _ = self.bulk_get_or_create(
+            ActFamily, ("label", "category_id"), zip(act_keys["family"], act_keys["category_id"])
+        )
+        act_keys["family_id"] = [
+            self.families[key].id for key in zip(act_keys["family"], act_keys["category_id"])
+        ]
+
+        self.acts, _ = self.bulk_get_or_create(Act, ("label", "family_id"), zip(act_keys["act"], act_keys["family_id"]))
+
+        self.operators, _ = self.bulk_get_or_create(
+            Operator, ("name",), zip(column_values(df, "modified_by").unique()),
+            country=self.country
+        )
+
+        policy_keys = pd.DataFrame({
+            "employer": column_values(df, "employer_name"),
+            "number": column_values(df, "policy_number"),
+        }).drop_duplicates()
+        is_text = policy_keys.apply(lambda s: s.map(type).eq(str))
+        employers = policy_keys.loc[is_text["employer"], "employer"].unique()
+        self.clients, _ = self.bulk_get_or_create(
+            Client, ("name",), zip(employers),
+            country=self.country, file=self.file
+        )
+        self.policies, _ = self.bulk_get_or_create(
+            Policy, ("policy_number", "client_id"),
+            (
+                (number, self.clients[(name,)].id)
+                for name, number in policy_keys[is_text.all(axis=1)].itertuples(index=False)
+            ),
+            file=self.file
+        )
+
+        partner_keys = pd.DataFrame({
+            "name": column_values(df, "partner_name"),
+            "country": column_values(df, "partner_country").astype(object),
+        }).drop_duplicates()
+        partner_keys = partner_keys[partner_keys["name"].map(type).eq(str)]
+        countries = partner_keys["country"].map(self.resolve_country)
+        self.partners, _ = self.bulk_get_or_create(
+            Partner, ("name", "country_id"),
+            (
+                (name, country.id)
+                for name, country in zip(partner_keys["name"], countries)
+                if country is not None
+            )
+        )
+
+    def insured_employer_defaults(self, insured, status, insured_dict, main_insured_name):
+        """
+        Prépare les valeurs de création d'une relation InsuredEmployer.
+
         Args:
             insured (Insured): L'assuré
-            employer (Client): L'employeur/client
-            policy (Policy): La police
-            status (str): Le statut de l'assuré (A, C, E)
+            status (str): Le statut de l'assuré (A, C, E), déjà en majuscules
             insured_dict (dict): Dictionnaire des assurés créés
             main_insured_name (str): Nom de l'assuré principal (pour les dépendants)
-            
+
         Returns:
-            InsuredEmployer: La relation créée ou récupérée
+            dict: Le rôle, l'assuré principal de référence, le fichier et la session d'import
         """
-        try:
-            # Déterminer le rôle basé sur le statut
-            role = {'A': 'primary', 'C': 'spouse', 'E': 'child'}.get(status.upper(), 'other')
-            
-            # Déterminer la référence de l'assuré principal
-            primary_insured_ref = None
-            if role != 'primary' and main_insured_name:
-                primary_insured_ref = insured_dict.get(main_insured_name.strip())
-                if not primary_insured_ref:
-                    self.logger_service.log_warning(
-                        f"Assuré principal non trouvé pour {insured.name}",
-                        details={
-                            "nom_principal_recherché": main_insured_name,
-                            "role": role
-                        }
-                    )
-            
-            insured_employer, created = InsuredEmployer.objects.get_or_create(
-                insured=insured,
-                employer=employer,
-                policy=policy,
-                defaults=dict(
-                    role=role,
-                    primary_insured_ref=primary_insured_ref,
-                    file=self.file,
-                    import_session=self.import_session
-                ),
-                creation_date=make_aware(date),
-            )
-            
-            if created:
-                self.logger_service.log_info(f"Nouvelle relation InsuredEmployer créée", {
-                    "assuré": insured.name,
-                    "employeur": employer.name,
-                    "police": policy.policy_number,
-                    "role": role,
-                    "principal_ref": primary_insured_ref.name if primary_insured_ref else None
-                })
-            else:
-                self.logger_service.log_info(f"Relation InsuredEmployer existante trouvée", {
-                    "assuré": insured.name,
-                    "employeur": employer.name,
-                    "police": policy.policy_number
-                })
-            
-            return insured_employer
-            
-        except Exception as e:
-            self.logger_service.log_error(
-                f"Erreur lors de la création de InsuredEmployer",
-                details={
-                    "assuré": insured.name,
-                    "employeur": employer.name,
-                    "police": policy.policy_number,
-                    "status": status
-                },
-                exception=e
-            )
-            raise
+        # Déterminer le rôle basé sur le statut
+        role = {'A': 'primary', 'C': 'spouse', 'E': 'child'}.get(status, 'other')
+
+        # Déterminer la référence de l'assuré principal
+        primary_insured_ref = None
+        if role != 'primary' and isinstance(main_insured_name, str):
+            primary_insured_ref = insured_dict.get(main_insured_name.strip())
+            if not primary_insured_ref:
+                self.logger_service.log_warning(
+                    f"Assuré principal non trouvé pour {insured.name}",
+                    details={
+                        "nom_principal_recherché": main_insured_name,
+                        "role": role
+                    }
+                )
+
+        return dict(
+            role=role,
+            primary_insured_ref=primary_insured_ref,
+            file=self.file,
+            import_session=self.import_session
+        )
 
 
-    @staticmethod
-    def get_or_create_category(label):
+    def get_or_create_category(self, label):
         """
         Retrieves or creates an ActCategory object based on the given label.
         
         The label is stripped and uppercased before being used in the get_or_create call.
-        If the label is not a string, it is replaced with a single space.
+        If the label is not a string, it is replaced with an empty string, the key used by `preload_reference_objects`.
+        Categories are cached by label, so each one costs at most one query per import.
         """
         
-        if isinstance(label, str):
-            label = label.strip()
-        else:
-            label = " "
-        return ActCategory.objects.get_or_create(label=label.strip().upper())[0]
+        label = label.strip().upper() if isinstance(label, str) else ""
+        key = (label,)
+        if key not in self.categories:
+            self.categories[key] = ActCategory.objects.get_or_create(label=label)[0]
+        return self.categories[key]
 
 
-    @staticmethod
-    def get_or_create_family(label, category):
+    def get_or_create_family(self, label, category):
         """
         Retrieves or creates an ActFamily object based on the given label and category.
         
         The label is stripped and uppercased before being used in the get_or_create call.
-        If the label is not a string, it is replaced with a single space.
+        If the label is not a string, it is replaced with an empty string, the key used by `preload_reference_objects`.
+        Families are cached by (label, category), so each one costs at most one query per import.
         """
         
-        if isinstance(label, str):
-            label = label.strip()
-        else:
-            label = " "
-        return ActFamily.objects.get_or_create(label=label.strip().upper(), category=category)[0]
+        label = label.strip().upper() if isinstance(label, str) else ""
+        key = (label, category.id)
+        if key not in self.families:
+            self.families[key] = ActFamily.objects.get_or_create(label=label, category=category)[0]
+        return self.families[key]
 
-    @staticmethod
-    def get_or_create_act(label, family):
+    def get_or_create_act(self, label, family):
         """
         Retrieves or creates an Act object based on the given label, family, and category.
 
@@ -532,12 +856,29 @@ class DataMapper:
         Returns:
             Act: The retrieved or created Act object.
         """
-        if isinstance(label, str):
-            label = label.strip().upper()
-        else:
-            label = " "
-        return Act.objects.get_or_create(label=label.strip().upper(), family=family)[0]
+        label = label.strip().upper() if isinstance(label, str) else ""
+        key = (label, family.id)
+        if key not in self.acts:
+            self.acts[key] = Act.objects.get_or_create(label=label, family=family)[0]
+        return self.acts[key]
+
 
+    def resolve_country(self, country_name):
+        """
+        Returns the Country matching `country_name` (case-insensitive), or the user's
+        country when the name is missing or unknown.
+
+        Args:
+            country_name (str): The country name from the stat file.
+
+        Returns:
+            Country or None: The resolved country, None if neither exists.
+        """
+        if isinstance(country_name, str):
+            country = self.countries_by_name.get(country_name.strip().lower())
+            if country:
+                return country
+        return self.user_country
 
     def get_or_create_partner(self, name, country_name):                
         """
@@ -547,72 +888,49 @@ class DataMapper:
         If no country can be found, a ValueError is raised.
 
         Args:
-            name (str): The partner's name.
+            name (str): The partner's name, already stripped and uppercased (see `normalize_text_columns`).
             country_name (str): The country name associated with the partner.
-            user (User): The user associated with the partner.
 
         Returns:
             Partner: The retrieved or created Partner object.
         """
-        if isinstance(country_name, str):
-            country_name = country_name.strip()
-        else:
-            country_name = None
-
-        country = Country.objects.filter(name__iexact=country_name).first()
-        if not country:
-            country = self.user.country
-
+        country = self.resolve_country(country_name)
         if not country:
             raise ValueError(
                 f"Impossible de déterminer le pays pour le partenaire '{name}'. "
                 f"Ni '{country_name}' ni le pays de l'utilisateur ({getattr(self.user, 'username', self.user)}) n'existent."
             )
 
-        return Partner.objects.get_or_create(name=name.strip().upper(), country=country)[0]
+        if not isinstance(name, str):
+            raise ValueError(f"Nom de partenaire invalide : {name!r}")
+        key = (name, country.id)
+        if key not in self.partners:
+            self.partners[key] = Partner.objects.get_or_create(name=name, country=country)[0]
+        return self.partners[key]
     
-    @staticmethod
-    def get_or_create_payment_method(number, date, provider):            
+    def payment_method_defaults(self, number, date, provider):
         """
-        Retrieves or creates a PaymentMethod object based on the given payment number, date, and provider.
+        Validates a payment method of the stat file and returns its lookup key and creation values.
 
-        This method attempts to parse the provided date string or object into an aware datetime object.
-        Supported date formats include "%m/%d/%Y", "%Y-%m-%d", pandas Timestamp, and Excel serial date numbers.
-        If the date format is unrecognized, a ValueError is raised.
+        The PaymentMethod objects themselves are fetched or created in bulk after the claims loop
+        (see `bulk_get_or_create`). The date is expected already parsed (see `parse_dates`);
+        a missing date raises a ValueError.
 
         Args:
             number (str): The payment number.
-            date (Union[str, datetime, pd.Timestamp, int, float]): The date of the payment, which can be a string,
-                datetime object, pandas Timestamp, or an Excel serial date number.
+            date (pd.Timestamp): The aware date of the payment.
             provider (Partner): The provider associated with this payment method.
 
         Returns:
-            PaymentMethod: The retrieved or created PaymentMethod object.
+            tuple: The (payment_number, provider_id) key and the creation values for this key.
         """
 
-        if isinstance(date, str):
-            try:
-                date = make_aware(datetime.strptime(date, "%m/%d/%Y"))
-            except ValueError:
-                try:
-                    date = make_aware(datetime.strptime(date, "%Y-%m-%d"))
-                except ValueError:
-                    date = make_aware(pd.to_datetime(date).to_pydatetime())
-
-        elif isinstance(date, (pd.Timestamp, datetime)):
-            date = make_aware(pd.to_datetime(date).to_pydatetime())
-
-        elif isinstance(date, (int, float)):
-            date = make_aware(pd.to_datetime(date, unit='d', origin='1899-12-30').to_pydatetime())
+        if pd.isna(date):
+            raise ValueError(f"Format de date non reconnu : {date!r}")
+        if not isinstance(number, str):
+            raise ValueError(f"Numéro de paiement invalide : {number!r}")
 
-        else:
-            raise ValueError(f"Format de date non reconnu : {type(date)}")
-
-        return PaymentMethod.objects.get_or_create(
-            payment_number=number.strip(),
-            provider=provider,
-            defaults=dict(emission_date=date)
-        )[0]
+        return (number.strip(), provider.id), dict(emission_date=date)
 
 
 
@@ -621,12 +939,17 @@ class DataMapper:
         Retrieves or creates a Client object based on the given name.
 
         Args:
-            name (str): The client name.
+            name (str): The client name, already stripped and uppercased (see `normalize_text_columns`).
 
         Returns:
             Client: The retrieved or created Client object.
         """
-        return Client.objects.get_or_create(name=name.strip().upper(), country=self.country, file=self.file)[0]
+        if not isinstance(name, str):
+            raise ValueError(f"Nom de client invalide : {name!r}")
+        key = (name,)
+        if key not in self.clients:
+            self.clients[key] = Client.objects.get_or_create(name=name, country=self.country, file=self.file)[0]
+        return self.clients[key]
 
     def get_or_create_policy(self, number, client):
         
@@ -634,14 +957,18 @@ class DataMapper:
         Retrieves or creates a Policy object based on the given policy number and client.
 
         Args:
-            number (str): The policy number.
+            number (str): The policy number, already stripped and uppercased (see `normalize_text_columns`).
             client (Client): The client object associated with this policy.
 
         Returns:
             Policy: The retrieved or created Policy object.
         """
-
-        return Policy.objects.get_or_create(policy_number=number.strip().upper(), client=client, file=self.file)[0]
+        if not isinstance(number, str):
+            raise ValueError(f"Numéro de police invalide : {number!r}")
+        key = (number, client.id)
+        if key not in self.policies:
+            self.policies[key] = Policy.objects.get_or_create(policy_number=number, client=client, file=self.file)[0]
+        return self.policies[key]
 
     
     def get_or_create_operator(self, name):
@@ -654,133 +981,53 @@ class DataMapper:
         Returns:
             Operator: The retrieved or created Operator object.
         """
-        if isinstance(name, str):
-            name = name.strip()
-        else:
-            name = " "
-        return Operator.objects.get_or_create(name=name.strip().upper(), country=self.country)[0]
+        name = name.strip().upper() if isinstance(name, str) else ""
+        key = (name,)
+        if key not in self.operators:
+            self.operators[key] = Operator.objects.get_or_create(name=name, country=self.country)[0]
+        return self.operators[key]
 
 
-    def get_or_create_primary_insured(self, name, statut, date):
-        
+    def bulk_get_or_create_insureds(self, insureds):
         """
-        Retrieves or creates a primary insured based on the given name and status.
-
-        Args:
-            name (str): The name of the primary insured.
-            statut (str): The status of the primary insured, used to determine if the insured is a primary or not.
-
-        Returns:
-            Insured or None: The Insured object for the primary insured if created or found, otherwise None if the status is not "A".
-        """
-        if statut.upper() != "A":
-            return None
-
-        insured, _ = Insured.objects.get_or_create(
-            name=name.strip().upper(),
-            defaults=dict(
-                is_primary_insured=True,
-                is_spouse=False,
-                is_child=False,
-                creation_date=make_aware(date),
-                primary_insured=None,
-                file=self.file
-            )
-        )
-        return insured
-    
-    def get_or_create_dependent_insured(self, name, statut, principal_name, insured_dict, date):
+        Retrieves or creates, in bulk, the insureds named in `insureds`.
 
-        """
-        Retrieves or creates a dependent insured based on the given name and status.
+        Insureds are looked up by name only, as get_or_create did; the status and primary
+        insured are only used to create the missing ones.
 
         Args:
-            name (str): The name of the dependent insured.
-            statut (str): The status of the dependent insured, used to determine if they are a spouse or child.
-            principal_name (str): The name of the primary insured to which the dependent is linked.
-            insured_dict (dict): A dictionary mapping primary insured names to their respective Insured objects.
+            insureds (dict): Maps each name to a (status, primary insured) pair. The status is
+                "A" for a primary insured, "C" for a spouse and "E" for a child.
 
         Returns:
-            Insured or None: The Insured object for the dependent if created or found, otherwise None if conditions are not met.
+            dict: The Insured objects keyed by name.
         """
-
-        if statut.upper() == "A" or not principal_name:
-            return None  
-
-        primary_insured = insured_dict.get(principal_name.strip())
-        if not primary_insured:
-
-            print(f"[WARN] Assuré principal introuvable pour : {name} (réf: {principal_name})")
-            return None
-
-        is_spouse = statut.upper() == "C"
-        is_child = statut.upper() == "E"
-
-        insured, _ = Insured.objects.get_or_create(
-            name=name.strip().upper(),
-            defaults=dict(
-                is_primary_insured=False,
-                is_spouse=is_spouse,
-                is_child=is_child,
+        defaults = {
+            (name,): dict(
+                is_primary_insured=statut == "A",
+                is_spouse=statut == "C",
+                is_child=statut == "E",
                 primary_insured=primary_insured,
                 file=self.file
-            ),
-            creation_date=make_aware(date)
-        )
-        return insured
-
-
-
-    def get_or_create_invoice(self, number, claimed, reimbursed, provider, insured):
-        """
-        Retrieves or creates an invoice object based on the given parameters.
-
-        Args:
-            number (str|float|None): The invoice number, or None if no invoice number is provided.
-            claimed (float): The claimed amount.
-            reimbursed (float): The reimbursed amount.
-            provider (Partner): The provider object associated with this invoice.
-            insured (Insured): The insured object associated with this invoice.
-
-        Returns:
-            Invoice: The retrieved or created Invoice object.
-        """
-        cleaned_number = ""
-        if number is None:
-            cleaned_number = ""
-        elif isinstance(number, float):
-            if str(number).lower() == 'nan':
-                cleaned_number = ""
-            else:
-                cleaned_number = str(int(number)) if number.is_integer() else str(number).upper()
-        else:
-            cleaned_number = str(number).upper()
-        cleaned_number = cleaned_number.strip()
-
-        return Invoice.objects.get_or_create(
-            invoice_number=cleaned_number,
-            provider=provider,
-            insured=insured,
-            defaults=dict(
-                claimed_amount=claimed,
-                reimbursed_amount=reimbursed,
-                file=self.file
             )
-        )[0]
+            for name, (statut, primary_insured) in insureds.items()
+        }
+        objects, _ = self.bulk_get_or_create(Insured, ("name",), defaults, defaults=defaults)
+        return {name: insured for (name,), insured in objects.items()}
 
-
-
-    def get_or_create_claim(self, claim_id, status, date_claim, settlement_date, invoice, act, operator, insured, partner, policy):
+    def build_claim(self, claim_id, status, date_claim, settlement_date, invoice, act, operator, insured, partner, policy):
         """
-        Retrieves or creates a claim object based on the given parameters.
+        Builds, without saving it, the claim object for the given parameters.
+        The claims of an import are written together by `save_claims`.
 
         Args:
             claim_id (str): The claim id.
-            status (str): The claim status.
-            date_claim (str|datetime|int|float): The claim date.
-            settlement_date (str|datetime|int|float): The settlement date.
+            status (str): The one-letter claim status code (see `map_data`).
+            date_claim (pd.Timestamp): The aware claim date (see `parse_dates`).
+            settlement_date (pd.Timestamp): The aware settlement date.
 
-            invoice (Invoice): The invoice object associated with this claim.
+            invoice (Invoice): The invoice object associated with this claim, None if it is
+                resolved later (see `map_data`).
             act (Act): The act object associated with this claim.
             operator (Operator): The operator object associated with this claim.
             insured (Insured): The insured object associated with this claim.
@@ -788,39 +1035,56 @@ class DataMapper:
             policy (Policy): The policy object associated with this claim.
 
         Returns:
-            Claim: The retrieved or created Claim object.
-        """
-        if isinstance(date_claim, str):
-            try:
-                date_claim = make_aware(datetime.strptime(date_claim, "%m/%d/%Y"))
-            except ValueError:
-                try:
-                    date_claim = make_aware(datetime.strptime(date_claim, "%Y-%m-%d"))
-                except ValueError:
-                    date_claim = make_aware(pd.to_datetime(date_claim).to_pydatetime())
-
-        elif isinstance(date_claim, (pd.Timestamp, datetime)):
-            date_claim = make_aware(pd.to_datetime(date_claim).to_pydatetime())
-
-        elif isinstance(date_claim, (int, float)):
-            date_claim = make_aware(pd.to_datetime(date_claim, unit='d', origin='1899-12-30').to_pydatetime())
-
-        else:
-            raise ValueError(f"Format de date non reconnu : {type(date_claim)}")
-        return Claim.objects.update_or_create(
+            Claim: The unsaved Claim object.
+        """
+        if pd.isna(date_claim):
+            raise ValueError(f"Format de date non reconnu : {date_claim!r}")
+        if pd.isna(settlement_date):
+            raise ValueError(f"Format de date non reconnu : {settlement_date!r}")
+
+        return Claim(
             id=claim_id.strip(),
-            defaults=dict(
-                status=status[0] if isinstance(status, str) and status else " ",
-                claim_date=date_claim,
-                settlement_date = make_aware(settlement_date) if is_naive(settlement_date) else settlement_date,
-                invoice=invoice,
-                act=act,
-                operator=operator,
-                insured=insured,
-                partner=partner,
-                policy=policy,
-                file=self.file
-            )
-        )[0]
+            status=status,
+            claim_date=date_claim,
+            settlement_date=settlement_date,
+            invoice=invoice,
+            act=act,
+            operator=operator,
+            insured=insured,
+            partner=partner,
+            policy=policy,
+            file=self.file
+        )
 
+    @staticmethod
+    def save_claims(claims):
+        """
+        Writes the claims built by `build_claim` in batches of BULK_BATCH_SIZE, with the same
+        result as one update_or_create per claim.
 
+        When the backend supports it, each batch is a single INSERT ... ON CONFLICT (id) DO UPDATE
+        (bulk_create with update_conflicts). Otherwise the ids already in the database are updated
+        with bulk_update and the new ones inserted with bulk_create.
+
+        Args:
+            claims (iterable): Unsaved Claim objects with distinct ids.
+        """
+        claims = list(claims)
+        if connection.features.supports_update_conflicts_with_target:
+            Claim.objects.bulk_create(
+                claims,
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=CLAIM_UPDATE_FIELDS,
+            )
+            return
+
+        for start in range(0, len(claims), BULK_BATCH_SIZE):
+            batch = claims[start:start + BULK_BATCH_SIZE]
+            # Seuls les identifiants sont lus, sans instancier les sinistres existants
+            existing = set(
+                Claim.objects.filter(id__in=[claim.id for claim in batch]).values_list("id", flat=True)
+            )
+            Claim.objects.bulk_update([claim for claim in batch if claim.id in existing], CLAIM_UPDATE_FIELDS)
+            Claim.objects.bulk_create([claim for claim in batch if claim.id not in existing])
@@ -1,3 +1,6 @@
+import os
+import tempfile
+from django.conf import settings
 from django.db import transaction
 from django.forms import ValidationError
 import pandas as pd
@@ -9,6 +12,7 @@ from django.contrib.auth import get_user_model
 from django.db.models import Q
 from .cleaning_service import CleaningService
 from .comparison_service import ComparisonService
+from .data_mapper import CATEGORY_COLUMNS
 from ..utils.functions import open_excel_csv, convert_dates_datetime
 from django.utils import timezone
 
@@ -43,7 +47,6 @@ class ImporterService:
             user=self.user,
             file=self.stat_file,
             file_type='stat',
-            size=self.stat_file.size,
             country=self.country
         )
 
@@ -51,7 +54,6 @@ class ImporterService:
             user=self.user,
             file=self.recap_file,
             file_type='recap',
-            size=self.recap_file.size,
             country=self.country
         )
 
@@ -72,8 +74,10 @@ class ImporterService:
 
 
     def open_files(self):
-        self.df_stat = open_excel_csv(self.stat_file)
-        self.df_recap = open_excel_csv(self.recap_file)
+        # Statistic CSV files are streamed chunk by chunk in clean_data instead
+        if not self.stat_file.name.endswith('.csv'):
+            self.df_stat = open_excel_csv(self.stat_file, file_type='stat')
+        self.df_recap = open_excel_csv(self.recap_file, file_type='recap')
         
 
 
@@ -81,7 +85,10 @@ class ImporterService:
     def clean_data(self):
 
         cleaner = CleaningService()
-        self.cleaned_stat = cleaner.clean_stat_dataframe(self.df_stat)
+        if self.df_stat is None:
+            self.cleaned_stat = cleaner.clean_stat_csv(self.stat_file)
+        else:
+            self.cleaned_stat = cleaner.clean_stat_dataframe(self.df_stat)
         self.cleaned_recap = cleaner.clean_recap_dataframe(self.df_recap)
 
         self.cleaned_stat = convert_dates_datetime(self.cleaned_stat, 'payment_date')
@@ -107,20 +114,18 @@ class ImporterService:
 
     def compare_data(self):
         comparator = ComparisonService()
-        compared_df = comparator.compare_dataframes(
+        stat_in_range, recap_in_range = comparator.filter_common_range(
             self.cleaned_stat,
             self.cleaned_recap,
             self.common_range
         )
+        compared_df = comparator.compare_dataframes(stat_in_range, recap_in_range)
 
         self.invalid_data, self.valid_data = comparator.extract_non_conformity(compared_df)
         
         valid_claim_ids = set(self.valid_data['claim_id'].unique())
         self.valid_stats = self.cleaned_stat[self.cleaned_stat['claim_id'].isin(valid_claim_ids)].copy()
 
-        self.invalid_data.to_excel("invalid_data.xlsx", index=False)
-
-
         if self.invalid_data.empty:
             self.import_session.status = 'completed'
             self.import_session.save()
@@ -136,10 +141,26 @@ class ImporterService:
     def trigger_async_import(self):
         self.import_session.status = 'processing'
         self.import_session.save()
-        async_import_data.delay(
-            self.valid_stats.to_dict(orient='records'),
-            self.import_session.id
+
+        # Les données validées transitent par un fichier (dtypes conservés) et non par le broker :
+        # seul le chemin est sérialisé dans le message Celery. Le fichier est créé hors de MEDIA_ROOT,
+        # sous un nom aléatoire et lisible par le seul propriétaire (mkstemp)
+        os.makedirs(settings.IMPORT_TMP_DIR, mode=0o700, exist_ok=True)
+        fd, stat_data_path = tempfile.mkstemp(
+            prefix=f"import_session_{self.import_session.id}_", suffix=".pkl", dir=settings.IMPORT_TMP_DIR
         )
+        os.close(fd)
+        try:
+            # Colonnes à faible cardinalité en category : fichier plus petit et DataFrame plus léger dans le worker
+            self.valid_stats.astype(
+                {column: "category" for column in self.valid_stats.columns.intersection(CATEGORY_COLUMNS)}
+            ).to_pickle(stat_data_path)
+
+            async_import_data.delay(stat_data_path, self.import_session.id)
+        except Exception:
+            # La tâche ne supprimera pas un fichier qu'elle n'a jamais reçu
+            os.remove(stat_data_path)
+            raise
 
 
     def run(self):
@@ -1,62 +1,144 @@
 # services/logging_service.py
 import os
+import queue
 import logging
-from datetime import datetime
+import traceback
+from logging.handlers import QueueHandler, QueueListener
 from django.conf import settings
 from file_handling.models import ImportSession
 
+# Séparateur des étapes, construit une fois pour toutes
+STEP_SEPARATOR = "🔹" * 50
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler dont le fichier est ouvert avec un tampon de 64 Ko : emit() n'écrit que dans
+    ce tampon et ne le vide qu'à partir du niveau ERROR, au lieu d'un flush par enregistrement.
+    flush() (appelé par close() et logging.shutdown()) vide toujours le tampon.
+    """
+    buffer_size = 64 * 1024
+    flush_level = logging.ERROR
+
+    def _open(self):
+        return open(
+            self.baseFilename, self.mode, buffering=self.buffer_size,
+            encoding=self.encoding, errors=self.errors
+        )
+
+    def emit(self, record):
+        # Comme FileHandler.emit / StreamHandler.emit, sans le flush systématique
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
 class ImportLoggerService:
+    # Services ouverts dans ce processus, par session d'import (voir for_session)
+    _cache = {}
+    # Dossier des logs, créé au premier service du processus
+    _logs_dir = None
+
     def __init__(self, import_session_id):
         self.import_session_id = import_session_id
         self.log_file_path = self._create_log_file_path()
         self.logger = self._setup_logger()
+
+    @classmethod
+    def for_session(cls, import_session_id):
+        """
+        Retourne le service de log de la session, en le créant au premier appel.
+
+        La tâche Celery et le DataMapper (et les relances de la tâche dans le même worker)
+        partagent ainsi un seul fichier et un seul handler au lieu d'en recréer un chacun.
+
+        Args:
+            import_session_id (int): ID de la session d'import.
+
+        Returns:
+            ImportLoggerService: Le service de log de la session.
+        """
+        service = cls._cache.get(import_session_id)
+        if service is None:
+            service = cls._cache[import_session_id] = cls(import_session_id)
+        return service
         
     def _create_log_file_path(self):
         """Crée le chemin du fichier de log pour cette session d'import"""
-        logs_dir = os.path.join(settings.MEDIA_ROOT, 'import_logs')
-        os.makedirs(logs_dir, exist_ok=True)
+        cls = type(self)
+        if cls._logs_dir is None:
+            logs_dir = os.path.join(settings.MEDIA_ROOT, 'import_logs')
+            os.makedirs(logs_dir, exist_ok=True)
+            cls._logs_dir = logs_dir
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"import_session_{self.import_session_id}_{timestamp}.txt"
-        return os.path.join(logs_dir, filename)
+        # Un seul fichier par session : les relances y ajoutent leurs lignes (mode 'a')
+        filename = f"import_session_{self.import_session_id}.log"
+        return os.path.join(cls._logs_dir, filename)
     
     def _setup_logger(self):
-        """Configure un logger spécifique pour cette session d'import"""
+        """
+        Configure un logger spécifique pour cette session d'import.
+
+        Les enregistrements passent par une file : l'écriture dans le fichier est faite
+        par le thread du QueueListener, pas par le thread qui exécute l'import.
+        """
         logger_name = f"import_session_{self.import_session_id}"
         logger = logging.getLogger(logger_name)
         logger.setLevel(logging.DEBUG)
         
         logger.handlers.clear()
         
-        file_handler = logging.FileHandler(self.log_file_path, mode='w', encoding='utf-8')
+        # delay=True : le fichier n'est ouvert qu'à la première écriture
+        file_handler = BufferedFileHandler(self.log_file_path, mode='a', encoding='utf-8', delay=True)
         file_handler.setLevel(logging.DEBUG)
         
         formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)-8s | %(message)s\n' + '='*80 + '\n',
+            '%(asctime)s | %(levelname)-8s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        self.file_handler = file_handler
+
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(log_queue)
+        logger.addHandler(self.queue_handler)
+        self.listener = QueueListener(log_queue, file_handler)
+        self.listener.start()
         
         return logger
     
     def log_info(self, message, details=None):
         """Log une information"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         full_message = self._format_message("INFO", message, details)
         self.logger.info(full_message)
     
     def log_warning(self, message, details=None, line_index=None):
         """Log un warning"""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         full_message = self._format_message("WARNING", message, details, line_index)
         self.logger.warning(full_message)
     
     def log_error(self, message, details=None, line_index=None, exception=None):
         """Log une erreur"""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         full_message = self._format_message("ERROR", message, details, line_index, exception)
         self.logger.error(full_message)
     
     def log_critical(self, message, details=None, exception=None):
         """Log une erreur critique"""
+        if not self.logger.isEnabledFor(logging.CRITICAL):
+            return
         full_message = self._format_message("CRITICAL", message, details, exception=exception)
         self.logger.critical(full_message)
     
@@ -77,20 +159,21 @@ class ImportLoggerService:
         
         if exception:
             formatted_parts.append(f"Exception: {type(exception).__name__}: {str(exception)}")
-            if hasattr(exception, '__traceback__') and exception.__traceback__:
-                import traceback
+            if getattr(exception, '__traceback__', None):
+                # Trace de l'exception reçue, et non de celle en cours de traitement (format_exc)
                 formatted_parts.append("Traceback:")
-                formatted_parts.append(traceback.format_exc())
+                formatted_parts.append(
+                    "".join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+                )
         
         return "\n".join(formatted_parts)
     
     def log_step_start(self, step_name, step_number=None):
         """Log le début d'une étape"""
-        separator = "🔹" * 50
         if step_number:
-            message = f"\n{separator}\nÉTAPE {step_number}: {step_name}\n{separator}"
+            message = f"\n{STEP_SEPARATOR}\nÉTAPE {step_number}: {step_name}\n{STEP_SEPARATOR}"
         else:
-            message = f"\n{separator}\n{step_name}\n{separator}"
+            message = f"\n{STEP_SEPARATOR}\n{step_name}\n{STEP_SEPARATOR}"
         self.log_info(message)
     
     def log_step_end(self, step_name, success=True, stats=None):
@@ -111,7 +194,9 @@ class ImportLoggerService:
         return self.log_file_path
     
     def close(self):
-        """Ferme le logger et ses handlers"""
-        for handler in self.logger.handlers:
-            handler.close()
-        self.logger.handlers.clear()
\ No newline at end of file
+        """Vide la file, ferme le fichier de log et détache le handler de ce service"""
+        if self._cache.get(self.import_session_id) is self:
+            del self._cache[self.import_session_id]
+        self.listener.stop()
+        self.file_handler.close()
+        self.logger.removeHandler(self.queue_handler)
\ No newline at end of file
@@ -1,76 +1,101 @@
+import os
 from celery import shared_task
 import pandas as pd
 from .services.data_mapper import DataMapper
 from file_handling.models import ImportSession
+from django.conf import settings
 from django.utils import timezone
+from dashboard.signals import clear_filter_options_cache
 from django.core.exceptions import ValidationError
 from importer.services.logging_service import ImportLoggerService
 import logging
 logger = logging.getLogger(__name__)
 
 @shared_task
-def async_import_data(stat_data_dict, import_session_id):
-    logger = logging.getLogger(__name__)
+def async_import_data(stat_data_path, import_session_id):
     logger.info(f"Début du traitement de la tâche d'import pour la session {import_session_id}")
+
+    # read_pickle exécute le contenu du fichier : seuls les fichiers déposés par trigger_async_import sont lus
+    if os.path.dirname(os.path.realpath(stat_data_path)) != os.path.realpath(settings.IMPORT_TMP_DIR):
+        logger.error(f"Fichier de données hors de IMPORT_TMP_DIR refusé : {stat_data_path}")
+        return
     
     import_session = ImportSession.objects.filter(id=import_session_id).first()
     
     if not import_session:
         logger.error(f"Aucune session d'import trouvée avec l'ID {import_session_id}")
+        # Données de la session supprimée (noms d'assurés, montants) : le fichier ne sera jamais lu
+        if os.path.exists(stat_data_path):
+            os.remove(stat_data_path)
         return
 
     # Initialisation du logger spécifique pour cette tâche
     import_logger = None
     
     try:
-        import_logger = ImportLoggerService(import_session_id)
+        import_logger = ImportLoggerService.for_session(import_session_id)
         import_logger.log_step_start("DÉBUT DE LA TÂCHE CELERY D'IMPORT")
         import_logger.log_info("Initialisation de la tâche", {
             "session_id": import_session_id,
-            "nombre_enregistrements": len(stat_data_dict)
+            "fichier_données": stat_data_path
         })
         
-        df_stat = pd.DataFrame(stat_data_dict)
-        import_logger.log_info(f"DataFrame créé avec succès", {
+        df_stat = pd.read_pickle(stat_data_path)
+        import_logger.log_info(f"DataFrame chargé avec succès", {
             "lignes": len(df_stat),
             "colonnes": len(df_stat.columns)
         })
         
-        mapper = DataMapper(df_stat=df_stat, import_session=import_session)
+        mapper = DataMapper(df_stat=df_stat, import_session=import_session, logger_service=import_logger)
         import_logger.log_info("DataMapper initialisé, début du mapping")
         
         mapper.map_data()
         
-        import_session.refresh_from_db()
-        import_session.status = ImportSession.Status.DONE
-        import_session.completed_at = timezone.now()
-        import_session.save()
+        # UPDATE ciblé : les compteurs déjà enregistrés par le mapper ne sont ni relus ni réécrits
+        completed_at = timezone.now()
+        ImportSession.objects.filter(pk=import_session_id).update(
+            status=ImportSession.Status.DONE,
+            completed_at=completed_at
+        )
+        # Les clients et polices créés en bulk n'émettent pas de post_save : options de filtre à rafraîchir.
+        # Une erreur du cache est journalisée sans faire échouer un import déjà validé
+        clear_filter_options_cache()
         
         import_logger.log_info("✅ TÂCHE CELERY TERMINÉE AVEC SUCCÈS", {
             "session_id": import_session_id,
             "statut_final": "DONE",
-            "heure_fin": timezone.now().isoformat()
+            "heure_fin": completed_at
         })
         
     except ValidationError as ve:
         if import_logger:
             import_logger.log_error("Erreur de validation dans la tâche Celery", exception=ve)
         
-        import_session.status = ImportSession.Status.ERROR
-        import_session.error_report = f"Erreur de validation : {str(ve)}"
-        import_session.completed_at = timezone.now()
-        import_session.save()
+        ImportSession.objects.filter(pk=import_session_id).update(
+            status=ImportSession.Status.ERROR,
+            message=f"Erreur de validation : {str(ve)}",
+            completed_at=timezone.now()
+        )
         
     except Exception as e:
         if import_logger:
             import_logger.log_critical("Erreur critique dans la tâche Celery", exception=e)
         
-        import_session.status = ImportSession.Status.ERROR
-        import_session.error_report = f"Erreur inattendue : {str(e)}"
-        import_session.completed_at = timezone.now()
-        import_session.save()
-        raise e
+        ImportSession.objects.filter(pk=import_session_id).update(
+            status=ImportSession.Status.ERROR,
+            message=f"Erreur inattendue : {str(e)}",
+            completed_at=timezone.now()
+        )
+        # Pas de relance : l'erreur est déjà enregistrée sur la session et dans son fichier de log
         
     finally:
+        if os.path.exists(stat_data_path):
+            os.remove(stat_data_path)
         if import_logger:
             import_logger.close()
+            # Logger fermé : le fichier est complet sur le disque (ou absent si rien n'a été écrit)
+            log_file_path = import_logger.get_log_file_path()
+            ImportSession.objects.filter(pk=import_session_id).update(
+                log_file_path=log_file_path,
+                log_file_exists=os.path.exists(log_file_path)
+            )
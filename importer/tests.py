@@ -6,22 +6,31 @@ from io import BytesIO
 from datetime import datetime
 from .utils.functions import (
     open_excel_csv,
+    csv_dtypes,
+    read_file_headers,
+    file_usecols,
     strip_accents,
     normalize_column_name,
     normalize_columns,
     clean_text_columns,
     replace_invalid_numeric_values,
+    coerce_numeric_columns,
+    clean_upper_text_columns,
     convert_dates_datetime,
+    convert_date_columns,
     get_date_range,
     get_common_date_range,
+    filter_date_range,
     concat_uniques,
     group_statistic_by_sinistre,
     convert_to_upper,
     check_conformity,
+    compute_conformity,
     df_no_conformity_by_sinistre,
     delete_conform_rows,
     string_to_upper,
     generate_observation,
+    generate_observations,
     generate_no_conformity_excel
 )
 
@@ -50,6 +59,60 @@ from .utils.functions import (
 #     with pytest.raises(ValueError, match="Format de fichier non pris en charge."):
 #         open_excel_csv(BytesIO(b"not a file"))
 
+def test_csv_dtypes():
+    csv_file = BytesIO(b"Numero de sinistre,Montant facture\n00123,10\n")
+    dtypes = csv_dtypes(csv_file, 'stat')
+    assert dtypes == {'Numero de sinistre': str}
+    assert csv_file.tell() == 0
+
+    df = pd.read_csv(csv_file, dtype=dtypes)
+    assert df['Numero de sinistre'].tolist() == ['00123']
+    assert csv_dtypes(csv_file, None) is None
+
+
+def test_read_file_headers():
+    csv_file = BytesIO("Numero de sinistre,Nom bénéficiaire\n00123,Alice\n".encode())
+    csv_file.name = 'stat.csv'
+    assert read_file_headers(csv_file) == ['Numero de sinistre', 'Nom bénéficiaire']
+    assert csv_file.tell() == 0
+
+    excel_file = BytesIO()
+    pd.DataFrame({'A': [1, 2], 'B': [3, 4]}).to_excel(excel_file, index=False)
+    excel_file.seek(0)
+    excel_file.name = 'stat.xlsx'
+    assert read_file_headers(excel_file) == ['A', 'B']
+
+    with pytest.raises(ValueError):
+        read_file_headers(BytesIO(b"x"))
+
+
+def test_clean_stat_csv_matches_clean_stat_dataframe():
+    from .services.cleaning_service import CleaningService
+
+    csv_file = BytesIO((
+        "Numero de sinistre,Nom bénéficiaire,Date de règlement,Montant facturé,Broker Name\n"
+        "S1, alice ,05/01/2024,\"1,5\",X\n"
+        "S2,bob,06/01/2024,20,X\n"
+        "S1, alice ,05/01/2024,\"1,5\",X\n"
+        ",carol,07/01/2024,30,X\n"
+        "S3,dave,08/01/2024,,X\n"
+    ).encode())
+    csv_file.name = 'stat.csv'
+
+    expected = CleaningService.clean_stat_dataframe(open_excel_csv(csv_file, file_type='stat'))
+    csv_file.seek(0)
+    result = CleaningService.clean_stat_csv(csv_file, chunksize=2)
+
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_file_usecols():
+    csv_file = BytesIO(b"Numero de sinistre,Broker Name,Montant facture\n00123,X,10\n")
+    df = pd.read_csv(csv_file, usecols=file_usecols('stat'))
+    assert df.columns.tolist() == ['Numero de sinistre', 'Montant facture']
+    assert file_usecols('recap') is None
+
+
 def test_strip_accents():
     assert strip_accents("éèêàç") == "eeeac"
     assert strip_accents("café") == "cafe"
@@ -81,6 +144,19 @@ def test_replace_invalid_numeric_values():
     with pytest.raises(KeyError, match="La colonne 'non_existent' n'existe pas dans le DataFrame."):
         replace_invalid_numeric_values(df, 'non_existent')
 
+def test_coerce_numeric_columns():
+    df = pd.DataFrame({'a': ['1,5', 'invalid', '–'], 'b': ['2', '-', '3.5'], 'text': ['x', 'y', 'z']})
+    result = coerce_numeric_columns(df, ['a', 'b', 'missing'])
+    assert result['a'].tolist() == [1.5, 0, 0]
+    assert result['b'].tolist() == [2, 0, 3.5]
+    assert result['text'].tolist() == ['x', 'y', 'z']
+
+def test_clean_upper_text_columns():
+    df = pd.DataFrame({'text': ['  Hello   World ', ' test \n\t string '], 'amount': [1.0, 2.0]})
+    result = clean_upper_text_columns(df)
+    assert result['text'].tolist() == ['HELLO WORLD', 'TEST STRING']
+    assert result['amount'].tolist() == [1.0, 2.0]
+
 def test_convert_dates_datetime():
     df = pd.DataFrame({'dates': ['2021-01-01', '2021-02-01', 'invalid']})
     convert_dates_datetime(df, 'dates')
@@ -90,6 +166,18 @@ def test_convert_dates_datetime():
     with pytest.raises(KeyError, match="La colonne 'non_existent' n'existe pas dans le DataFrame."):
         convert_dates_datetime(df, 'non_existent')
 
+def test_convert_date_columns():
+    df = pd.DataFrame({
+        'incident_date': ['01/02/2021', '01/02/2021', 'invalid'],
+        'payment_date': pd.to_datetime(['2021-02-05', '2021-02-06', '2021-02-07']),
+        'serial': [44228, 44229, 44230],
+    })
+    result = convert_date_columns(df, ['incident_date', 'payment_date', 'serial', 'missing'], format='%d/%m/%Y')
+    assert result['incident_date'].iloc[0] == pd.Timestamp('2021-02-01')
+    assert pd.isna(result['incident_date'].iloc[2])
+    assert result['payment_date'].iloc[0] == pd.Timestamp('2021-02-05')
+    assert result['serial'].iloc[0] == pd.Timestamp('2021-02-01')
+
 def test_get_date_range():
     df = pd.DataFrame({'dates': [pd.Timestamp('2021-01-01'), pd.Timestamp('2021-02-01')]})
     date_range = get_date_range(df, 'dates')
@@ -106,11 +194,26 @@ def test_get_common_date_range():
 
     assert get_common_date_range(None, range2) is None
 
+def test_filter_date_range():
+    dates = pd.to_datetime(['2021-01-01', '2021-01-10', '2021-01-20', '2021-01-31'])
+    date_range = (pd.Timestamp('2021-01-10'), pd.Timestamp('2021-01-20'))
+
+    sorted_df = pd.DataFrame({'payment_date': dates, 'value': [1, 2, 3, 4]})
+    assert filter_date_range(sorted_df, 'payment_date', date_range)['value'].tolist() == [2, 3]
+
+    unsorted_df = sorted_df.iloc[::-1]
+    assert filter_date_range(unsorted_df, 'payment_date', date_range)['value'].tolist() == [3, 2]
+
 def test_concat_uniques():
     series = pd.Series(['a', 'b', 'a', 'c', 'b'])
     result = concat_uniques(series, separator='; ')
     assert result == 'a; b; c'
 
+    mixed = pd.Series(['a', None, 1, 'a', float('nan'), 1])
+    assert concat_uniques(mixed) == 'a, 1'
+    assert concat_uniques(series.astype('category'), separator='; ') == 'a; b; c'
+    assert concat_uniques(pd.Series([2.5, 2.5, None])) == '2.5'
+
 # def test_group_statistic_by_sinistre():
 #     df = pd.DataFrame({
 #         'claim_id': [1, 1, 2, 3],
@@ -149,6 +252,23 @@ def test_check_conformity():
     assert check_conformity(row_conforme) == "Conforme"
     assert check_conformity(row_non_conforme) == "Non conforme"
 
+def test_compute_conformity():
+    df = pd.DataFrame({
+        "billed_amount_diff": [3, -4, 10, 0, float('nan')],
+        "reimbursement_amount_diff": [2, 4.5, 0, -12, 0],
+    })
+    assert compute_conformity(df).tolist() == [
+        "Conforme", "Conforme", "Non conforme", "Non conforme", "Non conforme"
+    ]
+
+def test_generate_observations_matches_row_function():
+    df = pd.DataFrame({
+        "billed_amount_diff": [10, -10, 0, 0, 5, 0],
+        "reimbursed_amount_diff": [0, 0, 7, -7, -5, 0],
+    })
+    expected = [generate_observation(row) for _, row in df.iterrows()]
+    assert generate_observations(df).tolist() == expected
+
 # Test pour df_no_conformity_by_sinistre
 # def test_df_no_conformity_by_sinistre():
 #     df = pd.DataFrame({
@@ -191,6 +311,28 @@ def test_string_to_upper():
     upper_df = string_to_upper(df)
     assert upper_df['text'].tolist() == ['HELLO', 'WORLD']
 
+def test_data_mapper_normalizes_columns_without_strings():
+    from .services.data_mapper import DataMapper, claim_status_codes
+
+    df = pd.DataFrame({
+        "act_name": [" consultation ", None],
+        "act_family": [float('nan'), float('nan')],
+        "modified_by": pd.Series([None, None], dtype="category"),
+        "beneficiary_name": [" alice ", "bob"],
+        "policy_number": [1234, 5678],
+        "partner_name": [float('nan'), float('nan')],
+    })
+    df = DataMapper.normalize_text_columns(df)
+    assert df["act_name"].tolist() == ["CONSULTATION", ""]
+    assert df["act_family"].tolist() == ["", ""]
+    assert df["modified_by"].tolist() == ["", ""]
+    assert df["beneficiary_name"].tolist() == ["ALICE", "BOB"]
+    assert df["policy_number"].tolist() == [1234, 5678]
+    assert df["partner_name"].isna().all()
+
+    assert claim_status_codes(pd.Series(["Payé", "", None])).tolist() == ["P", " ", " "]
+    assert claim_status_codes(pd.Series([float('nan'), float('nan')])).tolist() == [" ", " "]
+
 # def test_generate_observation():
 #     row_conforme = pd.Series({"Écart facturé": 3, "Écart remboursé": 2})
 #     row_non_conforme = pd.Series({"Écart facturé": 10, "Écart remboursé": 12})
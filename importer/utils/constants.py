@@ -59,3 +59,36 @@ COLUMN_SYNONYMS = {
     'date_sinistre': 'incident_date',
     'modifie_par': 'modified_by',
 }
+
+
+# Dtypes forced when reading import CSV files, keyed by normalized column name.
+# Identifiers are read as text so that read_csv skips type inference on them and
+# keeps leading zeros; amounts and dates are converted later by CleaningService.
+
+STAT_DTYPES = {
+    'claim_id': str,
+    'policy_number': str,
+    'invoice_number': str,
+    'payment_date': str,
+    'incident_date': str,
+}
+
+RECAP_DTYPES = {
+    'claim_id': str,
+    'payment_date': str,
+}
+
+FILE_TYPE_DTYPES = {
+    'stat': STAT_DTYPES,
+    'recap': RECAP_DTYPES,
+}
+
+
+# Columns dropped by CleaningService, keyed by normalized column name.
+# They are skipped when the file is read, so they are never parsed.
+
+STAT_COLUMNS_TO_DROP = ('unnamed_1', 'broker_name', 'broker_sunuid', 'adresse_du_partenaire')
+
+FILE_TYPE_DROPPED_COLUMNS = {
+    'stat': STAT_COLUMNS_TO_DROP,
+}
@@ -1,17 +1,33 @@
 import unicodedata
 import re
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 import os
+from importlib.util import find_spec
 from datetime import datetime
+from openpyxl import load_workbook
 from rest_framework.response import Response
-from .constants import COLUMN_SYNONYMS
+from .constants import COLUMN_SYNONYMS, FILE_TYPE_DTYPES, FILE_TYPE_DROPPED_COLUMNS
+import logging
 
-def open_excel_csv(file):
+logger = logging.getLogger(__name__)
+
+SEPARATORS_RE = re.compile(r'[\s\-_]+')
+# Seuls les blancs à réécrire : suites d'au moins deux blancs, ou tabulation / retour à la ligne isolés
+WHITESPACE_RUNS_RE = re.compile(r'\s\s+|[^\S ]')
+# Lecteur Excel en Rust (python-calamine) s'il est installé, sinon moteur par défaut de pandas (openpyxl)
+EXCEL_ENGINE = 'calamine' if find_spec('python_calamine') else None
+
+def open_excel_csv(file, file_type=None):
     """
     Opens an Excel or CSV file and loads it into a DataFrame.
 
     Args:
         file: The file to open, which can be an Excel file (.xlsx, .xls) or a CSV file (.csv).
+        file_type (str, optional): 'stat' or 'recap'. For CSV files, the known columns of this
+            file type are read with the dtypes of FILE_TYPE_DTYPES instead of being inferred.
+            The columns of FILE_TYPE_DROPPED_COLUMNS are not read at all.
 
     Returns:
         pd.DataFrame: The DataFrame containing the data from the file.
@@ -21,9 +37,9 @@ def open_excel_csv(file):
     """
     try:
         if file.name.endswith('.xlsx') or file.name.endswith('.xls'):
-            df = pd.read_excel(file)
+            df = pd.read_excel(file, engine=EXCEL_ENGINE, usecols=file_usecols(file_type))
         elif file.name.endswith('.csv'):
-            df = pd.read_csv(file)
+            df = pd.read_csv(file, dtype=csv_dtypes(file, file_type), usecols=file_usecols(file_type))
         else:
             raise ValueError("Format de fichier non pris en charge.")
         return df
@@ -31,6 +47,139 @@ def open_excel_csv(file):
         raise ValueError(f"Erreur lors de l'ouverture du fichier : {e}")
 
 
+def read_file_headers(file):
+    """
+    Reads only the header row of an Excel or CSV file, e.g. to validate its columns
+    before the whole file is loaded.
+
+    Args:
+        file: The file to read, which can be an Excel file (.xlsx, .xls) or a CSV file (.csv).
+            Its position is restored to the start.
+
+    Returns:
+        list: The column names, as read by `open_excel_csv`.
+
+    Raises:
+        ValueError: If the file format is unsupported or cannot be opened.
+    """
+    try:
+        if file.name.endswith('.xlsx') or file.name.endswith('.xls'):
+            columns = pd.read_excel(file, engine=EXCEL_ENGINE, nrows=0).columns
+        elif file.name.endswith('.csv'):
+            columns = pd.read_csv(file, nrows=0).columns
+        else:
+            raise ValueError("Format de fichier non pris en charge.")
+        return columns.tolist()
+    except Exception as e:
+        raise ValueError(f"Erreur lors de l'ouverture du fichier : {e}")
+    finally:
+        file.seek(0)
+
+
+def csv_dtypes(file, file_type):
+    """
+    Maps the raw header of a CSV file to the dtypes declared for its file type.
+
+    The dtypes in FILE_TYPE_DTYPES are keyed by normalized column name, while read_csv
+    expects the names as they appear in the file, so only the header row is read here.
+
+    Args:
+        file: The CSV file to read; its position is restored to the start.
+        file_type (str): 'stat' or 'recap'. Any other value yields no dtypes.
+
+    Returns:
+        dict or None: The dtype mapping to pass to read_csv, or None if there is none.
+    """
+    dtypes = FILE_TYPE_DTYPES.get(file_type)
+    if not dtypes:
+        return None
+    header = pd.read_csv(file, nrows=0).columns
+    file.seek(0)
+    return {col: dtypes[normalize_column_name(col)] for col in header
+            if normalize_column_name(col) in dtypes} or None
+
+
+def file_usecols(file_type):
+    """
+    Builds the `usecols` argument of read_csv/read_excel that skips the columns
+    dropped for this file type (see FILE_TYPE_DROPPED_COLUMNS).
+
+    Args:
+        file_type (str): 'stat' or 'recap'. Any other value keeps every column.
+
+    Returns:
+        callable or None: A predicate on the raw column names, or None to read them all.
+    """
+    dropped = FILE_TYPE_DROPPED_COLUMNS.get(file_type)
+    if not dropped:
+        return None
+    return lambda col: normalize_column_name(str(col)) not in dropped
+
+
+def count_csv_rows(file) -> int:
+    """
+    Counts the data rows of a CSV file (header excluded) by scanning raw bytes chunk by chunk.
+
+    Args:
+        file: A Django File/FieldFile opened in binary mode.
+
+    Returns:
+        int: The number of lines after the header.
+    """
+    line_count = 0
+    last_chunk = b''
+    for chunk in file.chunks():
+        line_count += chunk.count(b'\n')
+        last_chunk = chunk
+    if last_chunk and not last_chunk.endswith(b'\n'):
+        line_count += 1
+    return max(line_count - 1, 0)
+
+
+def preview_excel_csv(file, nrows=10, file_type=None):
+    """
+    Reads the first rows of an Excel or CSV file along with its dimensions,
+    without loading the whole file into a DataFrame.
+
+    Args:
+        file: The file to preview, which can be an Excel file (.xlsx, .xls) or a CSV file (.csv).
+        nrows (int): Number of data rows to return.
+        file_type (str, optional): 'stat' or 'recap', see `open_excel_csv`.
+
+    Returns:
+        tuple: (preview DataFrame, total number of data rows, total number of columns)
+
+    Raises:
+        ValueError: If the file format is unsupported or cannot be opened.
+    """
+    try:
+        if file.name.endswith('.csv'):
+            preview = pd.read_csv(file, nrows=nrows, dtype=csv_dtypes(file, file_type))
+            return preview, count_csv_rows(file), preview.shape[1]
+        elif file.name.endswith('.xlsx'):
+            workbook = load_workbook(file, read_only=True, data_only=True)
+            try:
+                sheet = workbook.active
+                rows = sheet.iter_rows(max_row=nrows + 1, values_only=True)
+                header = next(rows, ())
+                preview = pd.DataFrame(list(rows), columns=header)
+                if sheet.max_row is None:
+                    sheet.reset_dimensions()
+                    total_rows = sum(1 for _ in sheet.iter_rows(values_only=True))
+                else:
+                    total_rows = sheet.max_row
+                return preview, max(total_rows - 1, 0), len(header)
+            finally:
+                workbook.close()
+        elif file.name.endswith('.xls'):
+            df = pd.read_excel(file, engine=EXCEL_ENGINE)
+            return df.head(nrows), df.shape[0], df.shape[1]
+        else:
+            raise ValueError("Format de fichier non pris en charge.")
+    except Exception as e:
+        raise ValueError(f"Erreur lors de l'ouverture du fichier : {e}")
+
+
 def strip_accents(text: str) -> str:
     """
     Removes accents from a string using Unicode normalization.
@@ -45,12 +194,16 @@ def strip_accents(text: str) -> str:
         >>> strip_accents("éèêàç")
         'eeeac'
     """
+    if text.isascii():
+        # Rien à décomposer : cas de la plupart des en-têtes et valeurs
+        return text
     return ''.join(
         c for c in unicodedata.normalize('NFD', text)
         if unicodedata.category(c) != 'Mn'
     )
 
 
+@lru_cache(maxsize=1024)
 def normalize_column_name(col: str) -> str:
     """
     Normalizes a column name by:
@@ -60,6 +213,9 @@ def normalize_column_name(col: str) -> str:
     - replacing spaces, hyphens, and multiple underscores with a single underscore,
     - mapping to a standard name using the COLUMN_SYNONYMS dictionary.
 
+    Results are memoized: the same headers are normalized for every import file,
+    every CSV chunk and every dtype/usecols lookup.
+
     Args:
         col (str): Raw column name.
 
@@ -72,7 +228,7 @@ def normalize_column_name(col: str) -> str:
     """
     col = col.strip().lower()
     col = strip_accents(col)
-    col = re.sub(r'[\s\-_]+', '_', col)
+    col = SEPARATORS_RE.sub('_', col)
     return COLUMN_SYNONYMS.get(col, col)
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -108,16 +264,11 @@ def clean_text_columns(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The cleaned DataFrame with normalized text columns.
     """
-    for col in df.columns:
-        try:
-            if col in df.columns and pd.api.types.is_string_dtype(df[col]):
-                df.loc[:, col] = (
-                    df[col]
-                    .str.strip()
-                    .str.replace(r'\s+', ' ', regex=True)
-                )
-        except Exception as e:
-            print(f"Error processing column {col}: {e}")
+    text_columns = [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
+    if text_columns:
+        df[text_columns] = df[text_columns].apply(
+            lambda s: s.str.strip().str.replace(WHITESPACE_RUNS_RE, ' ', regex=True)
+        )
     return df
 
 
@@ -144,6 +295,52 @@ def replace_invalid_numeric_values(df, column, replacement_value=0):
     else:
         raise KeyError(f"La colonne '{column}' n'existe pas dans le DataFrame.")
 
+def coerce_numeric_columns(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """
+    Converts several amount columns to float64 in a single pass, applying the same
+    rules as `replace_invalid_numeric_values` (',' -> '.', dashes -> 0, invalid -> 0).
+
+    Args:
+        df (pd.DataFrame): The DataFrame to modify.
+        columns (list): The columns to convert. Columns missing from the DataFrame are ignored.
+
+    Returns:
+        pd.DataFrame: The DataFrame with the converted columns.
+    """
+    columns = df.columns.intersection(columns)
+    if len(columns):
+        df[columns] = (
+            df[columns]
+            .replace({',': '.', '–': '0', '-': '0'}, regex=True)
+            .apply(pd.to_numeric, errors='coerce')
+            .fillna(0)
+            .astype('float64')
+        )
+    return df
+
+
+def clean_upper_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans and uppercases every object column in one pass, combining
+    `clean_text_columns` and `convert_df_to_upper`:
+    - Stripping leading/trailing whitespace
+    - Replacing multiple spaces/tabs/newlines inside strings with a single space
+    - Converting to uppercase
+
+    Args:
+        df (pd.DataFrame): The input DataFrame.
+
+    Returns:
+        pd.DataFrame: The DataFrame with normalized text columns.
+    """
+    text_columns = df.select_dtypes(include='object').columns
+    if len(text_columns):
+        df[text_columns] = df[text_columns].apply(
+            lambda s: s.str.strip().str.replace(WHITESPACE_RUNS_RE, ' ', regex=True).str.upper()
+        )
+    return df
+
+
 def export_invalid_date_rows(df: pd.DataFrame, col: str, output_dir: str = 'downloads', filename_prefix: str = 'invalid_dates') -> str:
     """
     Exports rows with invalid or non-convertible dates in the specified column to an Excel file,
@@ -183,6 +380,10 @@ def convert_dates_datetime(df, column, format=None):
     """
     Converts a column to datetime type.
 
+    Text columns are parsed with a single `pd.to_datetime` call using `format` when given,
+    with `cache=True` so that repeated date strings are parsed only once. Integer columns
+    are read as Excel serial dates and datetime columns are left untouched.
+
     Args:
         df (pd.DataFrame): The DataFrame to modify.
         column (str): The name of the column to convert.
@@ -198,19 +399,21 @@ def convert_dates_datetime(df, column, format=None):
         df = df.copy()
         column_type = df[column].dtype
 
+        # Affectation de la colonne entière (et non df.loc[:, column]) : le dtype datetime64
+        # remplace directement l'object, sans écriture élément par élément dans l'ancien tableau
         if column_type == 'object':
-            df.loc[:, column] = pd.to_datetime(
+            df[column] = pd.to_datetime(
                 df[column], 
                 format=format, 
                 errors='coerce', 
-                dayfirst=True
+                dayfirst=True,
+                cache=True
             )
         elif column_type in ['int64', 'int32']:
-            df.loc[:, column] = pd.to_datetime(
+            df[column] = pd.to_datetime(
                 df[column], 
                 origin='1899-12-30', 
-                unit='D', 
-                dayfirst=True
+                unit='D'
             )
         # Check if conversion succeeded
         if not pd.api.types.is_datetime64_any_dtype(df[column]):
@@ -225,6 +428,49 @@ def convert_dates_datetime(df, column, format=None):
         raise KeyError(f"La colonne '{column}' n'existe pas dans le DataFrame.")
 
 
+def convert_date_columns(df, columns, format=None):
+    """
+    Converts several columns to datetime type at once.
+
+    Text columns are parsed together with a single `pd.to_datetime` call per column
+    (with `cache=True`, so repeated date strings are parsed only once), integer columns
+    are read as Excel serial dates and datetime columns are left untouched.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to modify.
+        columns (list): The columns to convert. Columns missing from the DataFrame are ignored.
+        format (str): Optional format string for parsing dates.
+
+    Returns:
+        pd.DataFrame: The DataFrame with the converted columns.
+
+    Raises:
+        TypeError: If a column could not be converted to datetime.
+    """
+    columns = df.columns.intersection(columns)
+    text_columns = [col for col in columns if df[col].dtype == 'object']
+    serial_columns = [col for col in columns if df[col].dtype in ['int64', 'int32']]
+
+    if text_columns:
+        df[text_columns] = df[text_columns].apply(
+            lambda s: pd.to_datetime(s, format=format, errors='coerce', dayfirst=True, cache=True)
+        )
+    if serial_columns:
+        df[serial_columns] = df[serial_columns].apply(
+            lambda s: pd.to_datetime(s, origin='1899-12-30', unit='D')
+        )
+
+    for col in columns:
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            # Seuls les numéros de ligne sont journalisés : les lignes contiennent des données personnelles
+            logger.warning(
+                "Problèmes de conversion pour la colonne '%s' (lignes %s)",
+                col, df.index[df[col].isna()][:10].tolist()
+            )
+            raise TypeError(f"La colonne '{col}' n'est pas de type datetime.")
+    return df
+
+
 def get_date_range(df, column):
     """
     Returns the date range (min, max) for a specified column in a DataFrame.
@@ -249,6 +495,30 @@ def get_date_range(df, column):
 
 
 
+def filter_date_range(df, column, date_range):
+    """
+    Keeps the rows of a DataFrame whose date column falls within a date range (bounds included).
+
+    When the column is sorted, the bounds are located with a binary search and the
+    DataFrame is sliced instead of being masked row by row.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to filter.
+        column (str): The name of the datetime column.
+        date_range (tuple): A tuple containing the (start, end) dates.
+
+    Returns:
+        pd.DataFrame: The rows within the date range.
+    """
+    start, end = date_range
+    dates = df[column]
+    if dates.is_monotonic_increasing:
+        lower = dates.searchsorted(start, side='left')
+        upper = dates.searchsorted(end, side='right')
+        return df.iloc[lower:upper]
+    return df[dates.between(start, end)]
+
+
 def get_common_date_range(range1, range2):
     """
     Determines the common date range between two date ranges.
@@ -285,7 +555,14 @@ def concat_uniques(series, separator=', '):
     Returns:
         str: A string containing the unique values.
     """
-    return separator.join(str(x) for x in series.dropna().unique())
+    values = series.to_numpy()
+    if values.dtype != object:
+        return separator.join(str(x) for x in series.dropna().unique())
+
+    # Colonnes texte (object ou category) : dédoublonnage par hachage sur le tableau numpy,
+    # sans Series intermédiaire, et str() seulement pour les valeurs qui ne sont pas déjà du texte
+    uniques = pd.unique(values[pd.notna(values)])
+    return separator.join(x if type(x) is str else str(x) for x in uniques)
 
 
 def group_statistic_by_sinistre(df):
@@ -305,13 +582,11 @@ def group_statistic_by_sinistre(df):
                         'policy_number', 'partner_name', 'incident_date', 
                         'payment_date', 'claim_status', 'amount_claimed', 'amount_reimbursed']
     
-    missing_colums = [col for col in required_columns if col not in df.columns]
+    columns = frozenset(df.columns)
+    missing_colums = [col for col in required_columns if col not in columns]
     if missing_colums:
         raise KeyError(f"Les colonnes suivantes sont manquantes: {missing_colums}")
 
-    if not all(col in df.columns for col in required_columns):
-        raise KeyError("Une ou plusieurs colonnes obligatoires sont manquantes.")
-
     grouped = df.groupby('claim_id').agg({
         'beneficiary_name': 'first',
         'main_insured': 'first',
@@ -400,6 +675,23 @@ def check_conformity(row):
         return "Non conforme"
 
 
+def compute_conformity(df):
+    """
+    Vectorized equivalent of `check_conformity` applied on every row.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the 'billed_amount_diff' and
+            'reimbursement_amount_diff' columns.
+
+    Returns:
+        pd.Categorical: 'Conforme' or 'Non conforme' for each row, stored as int8 codes.
+    """
+    billed_diff = df["billed_amount_diff"].to_numpy(dtype='float64')
+    reimbursement_diff = df["reimbursement_amount_diff"].to_numpy(dtype='float64')
+    is_conform = (np.abs(billed_diff) < 5) & (np.abs(reimbursement_diff) < 5)
+    return pd.Categorical.from_codes((~is_conform).astype(np.int8), categories=["Conforme", "Non conforme"])
+
+
 def df_no_conformity_by_sinistre(df):
     """
     Groups non-conforming data by claim number and aggregates the information.
@@ -503,6 +795,42 @@ def generate_observation(row):
     return "; ".join(observations) if observations else "Non conforme en raison d'écarts."
 
 
+def generate_observations(df):
+    """
+    Vectorized equivalent of `generate_observation` applied on every row.
+
+    The conditions checked by `generate_observation` are mutually exclusive, so at most
+    one observation applies to a row and a single `np.select` covers them all. It selects
+    int8 codes rather than the messages themselves, so no unicode array is built.
+
+    Args:
+        df (pd.DataFrame): DataFrame of non-conforming rows.
+
+    Returns:
+        pd.Categorical: The observation for each row, stored as int8 codes.
+    """
+    zeros = np.zeros(len(df))
+    ecart_facture = df["billed_amount_diff"].to_numpy(dtype='float64') if "billed_amount_diff" in df.columns else zeros
+    ecart_rembourse = df["reimbursed_amount_diff"].to_numpy(dtype='float64') if "reimbursed_amount_diff" in df.columns else zeros
+
+    conditions = [
+        (ecart_facture > 0) & (ecart_rembourse == 0),
+        (ecart_facture < 0) & (ecart_rembourse == 0),
+        (ecart_rembourse > 0) & (ecart_facture == 0),
+        (ecart_rembourse < 0) & (ecart_facture == 0),
+        ((ecart_facture > 0) & (ecart_rembourse < 0)) | ((ecart_facture < 0) & (ecart_rembourse > 0)),
+    ]
+    # Les deux écarts facturés donnent le même message (voir generate_observation) : même code
+    codes = np.select(conditions, np.array([0, 0, 1, 2, 3], dtype=np.int8), default=np.int8(4))
+    return pd.Categorical.from_codes(codes, categories=[
+        "Montant facturé statistique < montant facturé rapprochement.",
+        "Montant remboursé statistique > montant remboursé rapprochement.",
+        "Montant remboursé statistique < montant remboursé rapprochement.",
+        "Montants facturés et remboursés non conformes.",
+        "Non conforme en raison d'écarts.",
+    ])
+
+
 def generate_no_conformity_excel(df, df_stat, df_recap):
     """
     Generates an Excel file with multiple sheets for non-conformity data.
@@ -1,4 +1,4 @@
-import traceback
+import logging
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
@@ -16,6 +16,8 @@ from file_handling.models import File
 
 from .utils.functions import *
 
+logger = logging.getLogger(__name__)
+
 class FileUploadAndImportView(APIView):
     parser_classes = [MultiPartParser]
     permission_classes = [IsAuthenticated, IsTerritorialAdmin, IsTerritorialAdminAndAssignedCountry | IsChefDeptTech]
@@ -51,11 +53,11 @@ class FileUploadAndImportView(APIView):
 
 
         try:
-            df_stat = open_excel_csv(stat_file)
-            df_recap = open_excel_csv(recap_file)
-
-            missing_stat = [h for h in self.expected_stat_headers if h not in df_stat.columns]
-            missing_recap = [h for h in self.expected_recap_headers if h not in df_recap.columns]
+            # En-têtes seuls : les fichiers sont chargés (et le stat CSV lu par morceaux) par ImporterService
+            stat_columns = frozenset(read_file_headers(stat_file))
+            recap_columns = frozenset(read_file_headers(recap_file))
+            missing_stat = [h for h in self.expected_stat_headers if h not in stat_columns]
+            missing_recap = [h for h in self.expected_recap_headers if h not in recap_columns]
 
             if missing_stat or missing_recap:
                 return Response({
@@ -90,7 +92,7 @@ class FileUploadAndImportView(APIView):
             return Response({'detail': str(ve)}, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            print("Exception complète :\n", traceback.format_exc())
+            logger.exception("FileUploadAndImportView failed", extra={"user": user.id})
             return Response({'detail': 'Une erreur est survenue : ' + str(e)},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -127,6 +127,14 @@ STATIC_URL = "static/"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Private directory (never served) where validated import data waits for the Celery worker.
+# It must be on a filesystem shared by the web process and the worker.
+IMPORT_TMP_DIR = BASE_DIR / 'import_tmp'
+
+# When served behind nginx, set this to the internal location aliasing MEDIA_ROOT
+# (e.g. '/protected/') so downloads are handed off with X-Accel-Redirect.
+SENDFILE_URL_PREFIX = None
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -161,6 +169,19 @@ SIMPLE_JWT = {
 }
 
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Partagé entre les workers gunicorn et le worker Celery (qui vide ce cache après un import).
+    # Base Redis réservée à ce cache : clear() vide toute la base.
+    'filter_options': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+        'KEY_PREFIX': 'filter-options',
+    },
+}
+
 CELERY_BROKER_URL = 'redis://localhost:6379/0' 
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'